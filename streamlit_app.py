@@ -1,10 +1,152 @@
 import streamlit as st 
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import re
 from datetime import datetime
 
+# Tabla de traducción para quitar separadores de miles y el signo de moneda
+_MONEDA_STRIP = str.maketrans('', '', '$,')
+
+# Formateadores de montos ($1,234.56) y porcentajes (12.3%) para tarjetas y tablas
+_CURRENCY = "${:,.2f}".format
+_PCT = "{:.1f}%".format
+
+# Patrón para el formato de tiempo (XD, YH, ZM)
+_TIME_RE = re.compile(r'\((\d+)D,\s*(\d+)H,\s*(\d+)M\)')
+
+# Patrón de los conceptos de la comparación económica que son montos en $ (el resto son
+# filas de ROI); definido aquí para ubicar en un solo lugar qué filas se formatean como moneda
+_CONCEPT_MASK_RE = re.compile(r'Ahorro|Costo|Neto')
+
+# Formato numérico de las tablas resumen (unidad y flota)
+_NUM_FMT = {
+    'Tiempo (min)': '{:,.0f}',
+    'Tiempo (hrs)': '{:,.2f}',
+    'Porcentaje Tiempo': '{:,.1f}%',
+    'Consumo Combustible (L)': '{:,.2f}',
+    'Costo ($)': '${:,.2f}'
+}
+
+# Columnas de la tabla resumen que escalan linealmente con el número de unidades
+_FLEET_COLS = ['Tiempo (min)', 'Tiempo (hrs)', 'Consumo Combustible (L)', 'Costo ($)']
+
+# Layout común de las gráficas de barras
+_BAR_LAYOUT = dict(
+    uniformtext_minsize=8,
+    uniformtext_mode='hide',
+    font=dict(size=12),
+    hovermode='closest'  # Mostrar solo el trazo más cercano
+)
+
+# Formato de las etiquetas de barra en las gráficas de distribución, por columna graficada
+_DISTRIBUCION_TEXTTEMPLATE = {
+    'Tiempo (min)': '%{y:,.0f}',
+    'Costo ($)': '$%{y:,.2f}'
+}
+
+# Color de cada concepto en la gráfica de comparación económica (Ahorro, Costo, Neto)
+_COMPARACION_COLORES = {
+    'Ahorro Mensual': '#28a745',
+    'Ahorro Anual': '#28a745',
+    'Costo Inicial (Barras de Combustible)': '#FF6666',
+    'Costo Mensual (Monitoreo)': '#FF6666',
+    'Neto Mensual': '#66B2FF',
+    'Neto Anual': '#66B2FF'
+}
+
+# Layout de la gráfica de evolución del ROI (título, cuadrícula, tooltip unificado y spikes)
+_EVOLUCION_LAYOUT = dict(
+    title='Evolución del Ahorro, Costo y Ganancia Acumulada',
+    legend_title='Concepto',
+    hovermode='x unified',
+    font=dict(size=12),
+    plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
+    paper_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
+    hoverlabel=dict(
+        bgcolor="#2b2b2b",  # Fondo oscuro para el tooltip
+        font_size=12,
+        font_family="Arial",
+        font=dict(color='white')  # Texto en blanco
+    ),
+    xaxis=dict(
+        title='Mes',
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='rgba(128, 128, 128, 0.2)',
+        showspikes=True,
+        spikemode='across',
+        spikesnap='cursor',
+        spikecolor='rgba(0,0,0,0.3)',
+        spikethickness=1
+    ),
+    yaxis=dict(
+        title='Monto ($)',
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='rgba(128, 128, 128, 0.2)',
+        showspikes=True,
+        spikemode='across',
+        spikesnap='cursor',
+        spikecolor='rgba(0,0,0,0.3)',
+        spikethickness=1
+    ),
+    spikedistance=1000
+)
+
+# Beneficios clave que no dependen de los cálculos (el de ROI se arma en cada cálculo)
+_BENEFITS_STATIC = [
+    {"icon": "💰", "title": "Reducción de Costos", "description": "Disminuye los gastos en combustible al optimizar el tiempo en ralentí."},
+    {"icon": "📉", "title": "Ahorro Continuo", "description": "Genera ahorros mensuales y anuales significativos."},
+    {"icon": "🔧", "title": "Mejora Operativa", "description": "Optimiza el uso de combustible y mejora la eficiencia de tu flota."},
+]
+
+# Conceptos del desglose detallado en la pestaña 'Datos Recopilados' (unidad y flota)
+_DETALLE_CONCEPTOS = [
+    '⏱️ Tiempo en Ralentí',
+    '🚗 Tiempo en Movimiento',
+    '⌛ Tiempo Total',
+    '🔥 Consumo en Ralentí',
+    '⛽ Consumo en Movimiento',
+    '📊 Consumo Total',
+    '💸 Costo en Ralentí (100%)',
+    '💰 Costo en Ralentí Real',
+    '🚛 Costo en Movimiento',
+    '💵 Costo Total',
+    '📉 Merma Diaria Real',
+    '📊 Merma Semanal Real',
+    '📈 Merma Mensual Real',
+    '💹 Merma Anual Real',
+]
+
+# Plantillas HTML de las tablas de desglose detallado
+_DETALLE_TABLE_TMPL = (
+    '<table style="width: 100%; border-collapse: collapse;">'
+    '<thead><tr>'
+    '<th style="background-color: #28a745; color: white; font-weight: bold; text-align: center; padding: 0.75rem;">Concepto</th>'
+    '<th style="background-color: #28a745; color: white; font-weight: bold; text-align: center; padding: 0.75rem;">Valor</th>'
+    '</tr></thead>'
+    '<tbody>{rows}</tbody>'
+    '</table>'
+)
+_DETALLE_CELL_STYLE = 'background-color: #f8f9fa; color: #212529; border: 1px solid #dee2e6; padding: 0.75rem; font-size: 1rem; text-align: left;'
+_DETALLE_ROW_TMPL = f'<tr><td style="{_DETALLE_CELL_STYLE}">{{Concepto}}</td><td style="{_DETALLE_CELL_STYLE}">{{Valor}}</td></tr>'
+
+# Plantilla HTML de las tarjetas de métricas (ver create_metric_card)
+_CARD_TMPL = """
+    <div style="
+        background-color: #FFFFFF;
+        border-left: 5px solid {color};
+        padding: 15px;
+        margin: 10px 0;
+        border-radius: 5px;
+        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+    ">
+        <h4 style="color: {color}; margin-bottom: 5px;">{title}</h4>
+        <h2 style="color: #333333; margin-bottom: 5px;">{value}</h2>
+        <p style="color: #666666;">{subtitle}</p>
+    </div>
+    """
+
 # Funciones auxiliares
 def parse_time_string(time_str):
     """
@@ -16,44 +158,52 @@ def parse_time_string(time_str):
     Returns:
         int or None: Total de minutos si el formato es correcto, de lo contrario None.
     """
-    pattern = r'\((\d+)D,\s*(\d+)H,\s*(\d+)M\)'
-    match = re.search(pattern, time_str)
+    match = _TIME_RE.search(time_str)
     if match:
         days, hours, minutes = map(int, match.groups())
-        return days * 24 * 60 + hours * 60 + minutes
+        return days * 1440 + hours * 60 + minutes  # 1440 = 24 * 60
     return None
 
-def color_merma(row):
+def color_merma(df):
     """
     Función para colorear la fila de 'Ralentí Real' en la tabla.
     
     Args:
-        row (pd.Series): Fila de la tabla.
+        df (pd.DataFrame): Tabla completa (se aplica con axis=None).
         
     Returns:
-        list: Lista de estilos para cada celda de la fila.
+        pd.DataFrame: Estilos para cada celda de la tabla.
     """
-    if row['Concepto'] == 'Ralentí Real':
-        return ['background-color: #FFCCCC'] * len(row)
-    else:
-        return [''] * len(row)
+    mask = (df['Concepto'] == 'Ralentí Real').to_numpy()[:, None]
+    styles = np.where(np.broadcast_to(mask, df.shape), 'background-color: #FFCCCC', '')
+    return pd.DataFrame(styles, index=df.index, columns=df.columns)
 
-def highlight_positivo(val):
+def highlight_positivo(col):
     """
-    Resalta valores positivos en verde y negativos en rojo.
+    Resalta valores positivos en verde y negativos en rojo (se aplica por columna con Styler.apply).
     
     Args:
-        val (str): Valor de la celda.
+        col (pd.Series): Columna de la tabla; numérica o texto con formato de moneda.
         
     Returns:
-        str: Estilo CSS para la celda.
+        np.ndarray: Estilo CSS para cada celda de la columna.
+    """
+    if pd.api.types.is_numeric_dtype(col):
+        valores = col
+    else:
+        valores = pd.to_numeric(col.astype(str).str.translate(_MONEDA_STRIP), errors='coerce')
+    return np.select([valores > 0, valores < 0], ['color: green', 'color: red'], default='color: black')
+
+def render_detail_table(rows):
+    """
+    Muestra una tabla estática de desglose a partir de una lista de filas.
+    
+    Args:
+        rows (list[dict]): Filas con las claves 'Concepto' y 'Valor' ya formateadas como texto.
     """
-    try:
-        val_float = float(val.replace(',', '').replace('$', ''))
-        color = 'green' if val_float > 0 else 'red' if val_float < 0 else 'black'
-    except:
-        color = 'black'
-    return f'color: {color}'
+    html_rows = ''.join(_DETALLE_ROW_TMPL.format(**row) for row in rows)
+    html_rows = html_rows.replace('$', '&#36;')  # Evitar que Markdown interprete '$...$' como LaTeX
+    st.markdown(_DETALLE_TABLE_TMPL.format(rows=html_rows), unsafe_allow_html=True)
 
 def create_metric_card(title, value, subtitle, color):
     """
@@ -65,67 +215,487 @@ def create_metric_card(title, value, subtitle, color):
         subtitle (str): Información adicional o descripción.
         color (str): Color de borde y título.
     """
-    card_html = f"""
-    <div style="
-        background-color: #FFFFFF;
-        border-left: 5px solid {color};
-        padding: 15px;
-        margin: 10px 0;
-        border-radius: 5px;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.1);
-    ">
-        <h4 style="color: {color}; margin-bottom: 5px;">{title}</h4>
-        <h2 style="color: #333333; margin-bottom: 5px;">{value}</h2>
-        <p style="color: #666666;">{subtitle}</p>
-    </div>
+    st.markdown(_CARD_TMPL.format(title=title, value=value, subtitle=subtitle, color=color), unsafe_allow_html=True)
+
+def render_cards(card_specs):
+    """
+    Muestra una fila de tarjetas de métricas, una por columna.
+    
+    Args:
+        card_specs (list[dict]): Argumentos de `create_metric_card` para cada tarjeta.
+    """
+    cols = st.columns(len(card_specs))
+    for col, spec in zip(cols, card_specs):
+        with col:
+            create_metric_card(**spec)
+
+@st.cache_data(max_entries=32)
+def build_unit_df(idle_minutes, moving_minutes, total_minutes, idle_percentage, moving_percentage,
+                  combustible_ralenti, combustible_movimiento, combustible_total,
+                  costo_ralenti, costo_movimiento, costo_total):
+    """
+    Construye la tabla resumen de la unidad individual.
+    
+    Los argumentos son escalares, por lo que Streamlit puede reutilizar el DataFrame
+    en cada rerun mientras los datos calculados no cambien. Los valores se guardan sin
+    redondear; el redondeo de presentación lo aplica `_NUM_FMT`.
+    
+    Returns:
+        pd.DataFrame: Tabla con tiempo, porcentaje, consumo y costo por concepto.
+    """
+    data_unit = {
+        'Concepto': ['Ralentí Real', 'Movimiento', 'Total'],
+        'Tiempo (min)': [idle_minutes, moving_minutes, total_minutes],
+        'Tiempo (hrs)': [idle_minutes / 60, moving_minutes / 60, total_minutes / 60],
+        'Porcentaje Tiempo': [idle_percentage, moving_percentage, 100.0],
+        'Consumo Combustible (L)': [combustible_ralenti, combustible_movimiento, combustible_total],
+        'Costo ($)': [costo_ralenti, costo_movimiento, costo_total]
+    }
+    return pd.DataFrame(data_unit)
+
+def build_fleet_df(df_unit, num_unidades):
+    """
+    Construye la tabla resumen de la flota completa escalando la tabla por unidad.
+    
+    Args:
+        df_unit (pd.DataFrame): Tabla resumen de la unidad individual.
+        num_unidades (int): Cantidad de unidades en la flota.
+        
+    Returns:
+        pd.DataFrame: Tabla con tiempo, porcentaje, consumo y costo por concepto para toda la flota.
     """
-    st.markdown(card_html, unsafe_allow_html=True)
+    df_fleet = df_unit.copy()
+    df_fleet[_FLEET_COLS] = df_unit[_FLEET_COLS] * num_unidades
+    return df_fleet
 
-# Inicializar variables en session_state si no existen
-if 'calculado' not in st.session_state:
-    st.session_state.calculado = False
+def format_summary_df(df):
+    """
+    Convierte las columnas numéricas de una tabla resumen en texto con `_NUM_FMT`.
+    
+    Args:
+        df (pd.DataFrame): Tabla resumen de unidad o flota.
+        
+    Returns:
+        pd.DataFrame: Copia de la tabla con los valores ya formateados para mostrarse.
+    """
+    df_display = df.copy()
+    for col, fmt in _NUM_FMT.items():
+        df_display[col] = df[col].map(fmt.format)
+    return df_display
+
+def style_bar(fig, texttemplate, **layout):
+    """
+    Aplica el estilo común a una gráfica de barras: etiquetas en verde sobre cada barra
+    y el layout compartido `_BAR_LAYOUT`.
+    
+    Args:
+        fig (go.Figure): Gráfica de barras a estilizar.
+        texttemplate (str): Plantilla de texto de las etiquetas (p. ej. '$%{y:,.2f}').
+        **layout: Propiedades de layout adicionales propias de la gráfica (títulos de ejes, fondos).
+        
+    Returns:
+        go.Figure: La misma gráfica, ya estilizada.
+    """
+    fig.update_traces(
+        texttemplate=texttemplate,
+        textposition='outside',
+        textfont_color='green'  # Texto en verde
+    )
+    fig.update_layout(_BAR_LAYOUT, **layout)
+    return fig
+
+@st.cache_data(max_entries=64)
+def build_distribucion_fig(conceptos, tiempos, consumos, costos, columna, title):
+    """
+    Construye la gráfica de distribución (Ralentí Real vs Movimiento) de una columna.
+    
+    Args:
+        conceptos (tuple): Nombres de los conceptos a graficar.
+        tiempos (tuple): Tiempo en minutos de cada concepto.
+        consumos (tuple): Consumo de combustible (L) de cada concepto.
+        costos (tuple): Costo ($) de cada concepto.
+        columna (str): Columna a graficar ('Tiempo (min)' o 'Costo ($)').
+        title (str): Título de la gráfica.
+        
+    Returns:
+        go.Figure: Gráfica de barras lista para mostrarse.
+    """
+    import plotly.express as px  # Import diferido: plotly solo se carga al graficar
+
+    df = pd.DataFrame({
+        'Concepto': conceptos,
+        'Tiempo (min)': tiempos,
+        'Consumo Combustible (L)': consumos,
+        'Costo ($)': costos
+    })
+    fig = px.bar(
+        df,
+        x='Concepto',
+        y=columna,
+        title=title,
+        labels={columna: columna, 'Concepto': 'Actividad'},
+        color='Concepto',
+        color_discrete_sequence=['#28a745', '#66B2FF'],  # Verde para Ralentí Real y azul para Movimiento
+        text=columna,
+        hover_data={col: True for col in df.columns[1:] if col != columna}  # Las otras dos columnas
+    )
+    fig = style_bar(
+        fig,
+        _DISTRIBUCION_TEXTTEMPLATE[columna],
+        xaxis_title='Actividad',
+        yaxis_title=columna
+    )
+    return fig
+
+@st.cache_data(max_entries=64)
+def build_merma_real_fig(periodo, valor, title, color):
+    """
+    Construye la gráfica de una sola barra para la merma real de un período.
+    
+    Args:
+        periodo (str): Etiqueta de la barra (p. ej. 'Diaria', 'Anual').
+        valor (float): Merma real en $.
+        title (str): Título de la gráfica.
+        color (str): Color de la barra.
+        
+    Returns:
+        go.Figure: Gráfica de barras lista para mostrarse.
+    """
+    import plotly.graph_objects as go
+
+    # go.Bar directamente: para una sola barra no hace falta el DataFrame de plotly.express
+    fig = go.Figure(go.Bar(
+        x=[periodo],
+        y=[valor],
+        text=[_CURRENCY(valor)],
+        marker_color=color
+    ))
+    return style_bar(
+        fig,
+        '$%{y:,.2f}',
+        title=title,
+        xaxis_title='',
+        yaxis_title='Merma ($)',
+        plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+
+def build_evolucion_fig():
+    """
+    Construye la gráfica de evolución del ROI (ahorro, costo y ganancia acumulados) sin datos.
+    
+    La figura se guarda en st.session_state y en cada rerun solo se actualizan los
+    datos de sus trazos, en lugar de reconstruir trazos y layout desde cero.
+    
+    Returns:
+        go.Figure: Gráfica con los tres trazos vacíos y el layout ya aplicado.
+    """
+    import plotly.graph_objects as go
+
+    # Crear el gráfico de línea con mejoras (Scattergl: render WebGL). Figura declarada como
+    # dicts para que plotly la valide de una sola vez
+    hover = dict(
+        hoverinfo='x+y',
+        hovertemplate='Mes: %{x}<br>%{y:$,.2f}<extra></extra>'  # Formateo con comas
+    )
+    fig = go.Figure(
+        data=[
+            # Línea de Ahorro Acumulado
+            dict(type='scattergl', mode='lines', name='Ahorro Acumulado', line=dict(color='#00CC96'), **hover),
+            # Línea de Costo Acumulado
+            dict(type='scattergl', mode='lines', name='Costo Acumulado', line=dict(color='#FF0000'), **hover),
+            # Línea de Ganancia Acumulada
+            dict(type='scattergl', mode='lines', name='Ganancia Acumulada', line=dict(color='#636EFA'), **hover)
+        ],
+        layout=_EVOLUCION_LAYOUT
+    )
+
+    return fig
+
+@st.cache_data(max_entries=32)
+def build_comparacion(ahorro_mensual, ahorro_anual, costo_inicial, costo_mensual,
+                      neto_mensual, neto_anual, roi_meses, roi_dias):
+    """
+    Construye la tabla de comparación económica, separando los montos del ROI.
+    
+    Args:
+        ahorro_mensual (float): Ahorro mensual ($).
+        ahorro_anual (float): Ahorro anual ($).
+        costo_inicial (float): Costo inicial de las barras de combustible ($).
+        costo_mensual (float): Costo mensual del monitoreo para toda la flota ($).
+        neto_mensual (float): Ahorro neto mensual ($).
+        neto_anual (float): Ahorro neto anual ($).
+        roi_meses (str): Texto del ROI en meses.
+        roi_dias (str): Texto del ROI en días.
+        
+    Returns:
+        tuple: (df_valores, df_roi). `df_valores` contiene solo montos en $ (numéricos) y
+        `df_roi` las filas de ROI en texto.
+    """
+    data_comparacion = {
+        'Concepto': [
+            'Ahorro Mensual',
+            'Ahorro Anual',
+            'Costo Inicial (Barras de Combustible)',
+            'Costo Mensual (Monitoreo)',
+            'Neto Mensual',
+            'Neto Anual',
+            'Retorno de Inversión (ROI - Meses)',
+            'Retorno de Inversión (ROI - Días)'
+        ],
+        'Valor ($)': [
+            ahorro_mensual,
+            ahorro_anual,
+            costo_inicial,
+            costo_mensual,
+            neto_mensual,
+            neto_anual,
+            roi_meses,
+            roi_dias
+        ]
+    }
+    df_comparacion = pd.DataFrame(data_comparacion)
+
+    # Separar ROI para evitar errores de formateo (la máscara se evalúa una sola vez)
+    es_monto = df_comparacion['Concepto'].str.contains(_CONCEPT_MASK_RE)
+    df_valores = df_comparacion[es_monto].astype({'Valor ($)': float})
+    df_roi = df_comparacion[~es_monto]
+    return df_valores, df_roi
+
+@st.cache_data(max_entries=32)
+def render_comparacion_html(df_valores):
+    """
+    Genera la tabla de comparación económica como HTML estático con el formato y colores aplicados.
+    
+    Args:
+        df_valores (pd.DataFrame): Montos de la comparación (columnas 'Concepto' y 'Valor ($)').
+        
+    Returns:
+        str: HTML de la tabla, listo para `st.markdown(..., unsafe_allow_html=True)`.
+    """
+    html = (df_valores.style
+        .format({
+            'Valor ($)': '${:,.2f}'
+        })
+        .apply(highlight_positivo, subset=['Valor ($)'])
+        .hide(axis='index')
+        .to_html()
+    )
+    return html.replace('$', '&#36;')  # Evitar que Markdown interprete '$...$' como LaTeX
+
+def distribucion_inputs(df):
+    """
+    Extrae de la tabla resumen los valores (sin la fila 'Total') como tuplas hashables.
+    
+    Args:
+        df (pd.DataFrame): Tabla resumen de unidad o flota.
+        
+    Returns:
+        tuple: (conceptos, tiempos, consumos, costos) para las gráficas de distribución.
+    """
+    df = df[df['Concepto'] != 'Total']
+    return (
+        tuple(df['Concepto'].tolist()),
+        tuple(df['Tiempo (min)'].tolist()),
+        tuple(df['Consumo Combustible (L)'].round(2).tolist()),
+        tuple(df['Costo ($)'].tolist())
+    )
+
+@st.cache_data(max_entries=32)
+def calcular(idle_minutes, moving_minutes, combustible_total, precio_litro, num_unidades,
+             duration_days, porcentaje_reduccion, porcentaje_ralenti_real, renta_mensual, costo_por_pieza):
+    """
+    Calcula todas las métricas de merma, ahorro y ROI a partir de los datos ingresados.
+    
+    Es una función pura de sus argumentos escalares, por lo que Streamlit reutiliza el
+    resultado mientras las entradas no cambien.
+    
+    Args:
+        idle_minutes (int): Minutos en ralentí por unidad.
+        moving_minutes (int): Minutos en movimiento por unidad.
+        combustible_total (float): Combustible total consumido por unidad (L).
+        precio_litro (float): Precio por litro de combustible ($).
+        num_unidades (int): Cantidad de unidades en la flota.
+        duration_days (int): Duración del período analizado en días.
+        porcentaje_reduccion (int): Porcentaje de reducción de merma esperado.
+        porcentaje_ralenti_real (int): Porcentaje del ralentí considerado como merma.
+        renta_mensual (float): Renta mensual por unidad del servicio de monitoreo ($).
+        costo_por_pieza (float): Costo por unidad de las barras de combustible ($).
+        
+    Returns:
+        dict: Métricas calculadas, con las mismas claves que se guardan en session_state.
+    """
+    total_minutes = idle_minutes + moving_minutes
+
+    # Cálculo de porcentajes de tiempo
+    idle_percentage = (idle_minutes / total_minutes) * 100
+    moving_percentage = (moving_minutes / total_minutes) * 100
+
+    # Cálculo de consumo de combustible proporcional
+    combustible_ralenti = (idle_percentage / 100) * combustible_total
+    combustible_movimiento = (moving_percentage / 100) * combustible_total
+
+    # Cálculo de costos
+    costo_ralenti = combustible_ralenti * precio_litro
+    costo_movimiento = combustible_movimiento * precio_litro
+    costo_total = combustible_total * precio_litro
+
+    # Cálculo de merma total por todas las unidades
+    merma_total = costo_ralenti * num_unidades
+
+    # Escalado de merma según la duración del período
+    merma_diaria = merma_total / duration_days
+    merma_semanal = merma_diaria * 7
+    merma_mensual = merma_diaria * 30
+    merma_anual = merma_diaria * 365
+
+    # Cálculo de merma por unidad
+    merma_total_unit = costo_ralenti
+    merma_diaria_unit = merma_total_unit / duration_days
+    merma_semanal_unit = merma_diaria_unit * 7
+    merma_mensual_unit = merma_diaria_unit * 30
+    merma_anual_unit = merma_diaria_unit * 365
+
+    # Cálculo del ahorro potencial con reducción de merma
+    # Incorporar el % de ralentí real
+    ahorro_anual = merma_anual * (porcentaje_reduccion / 100) * (porcentaje_ralenti_real / 100)
+
+    # Cálculo del costo total de las barras de combustible
+    costo_total_barras = costo_por_pieza * num_unidades
+
+    # Cálculo del ahorro mensual
+    ahorro_mensual = ahorro_anual / 12
+
+    # Cálculo del ahorro neto mensual (Ahorro mensual - Renta mensual total)
+    neto_mensual = ahorro_mensual - (renta_mensual * num_unidades)
+
+    # La inversión solo es recuperable si el ahorro neto mensual es positivo
+    recoverable = neto_mensual > 0
+
+    # Cálculo del Retorno de Inversión (ROI) en meses
+    meses_para_recuperar = costo_total_barras / neto_mensual if recoverable else 0.0
+
+    # Cálculo del Retorno de Inversión (ROI) en días
+    if recoverable:
+        ahorro_neto_diario = neto_mensual / 30  # Asumiendo 30 días por mes
+        roi_days = costo_total_barras / ahorro_neto_diario
+    else:
+        roi_days = 0.0
+
+    # Cálculo del neto mensual y anual (ahorro - renta mensual total)
+    neto_anual = ahorro_anual - (renta_mensual * 12 * num_unidades)
+
+    # Cálculos Real Ralentí (usando el porcentaje ajustado por el usuario)
+    # Cada métrica real es la métrica base escalada por el mismo factor
+    factor_real = porcentaje_ralenti_real / 100
+    costo_ralenti_real_unit = costo_ralenti * factor_real
+    merma_diaria_real_unit = merma_diaria_unit * factor_real
+    merma_semanal_real_unit = merma_semanal_unit * factor_real
+    merma_mensual_real_unit = merma_mensual_unit * factor_real
+    merma_anual_real_unit = merma_anual_unit * factor_real
+
+    # Cálculos Real Ralentí para Flota
+    costo_ralenti_real_fleet = merma_total * factor_real
+    merma_diaria_real_fleet = merma_diaria * factor_real
+    merma_semanal_real_fleet = merma_semanal * factor_real
+    merma_mensual_real_fleet = merma_mensual * factor_real
+    merma_anual_real_fleet = merma_anual * factor_real
+
+    return {
+        'idle_minutes': idle_minutes,
+        'moving_minutes': moving_minutes,
+        'total_minutes': total_minutes,
+        'idle_percentage': idle_percentage,
+        'moving_percentage': moving_percentage,
+        'combustible_ralenti': combustible_ralenti,
+        'combustible_movimiento': combustible_movimiento,
+        'costo_ralenti': costo_ralenti,
+        'costo_movimiento': costo_movimiento,
+        'costo_total': costo_total,
+        'merma_total': merma_total,
+        'merma_diaria': merma_diaria,
+        'merma_semanal': merma_semanal,
+        'merma_mensual': merma_mensual,
+        'merma_anual': merma_anual,
+        'merma_total_unit': merma_total_unit,
+        'merma_diaria_unit': merma_diaria_unit,
+        'merma_semanal_unit': merma_semanal_unit,
+        'merma_mensual_unit': merma_mensual_unit,
+        'merma_anual_unit': merma_anual_unit,
+        'ahorro_anual': ahorro_anual,
+        'ahorro_mensual': ahorro_mensual,
+        'costo_total_barras': costo_total_barras,
+        'neto_mensual': neto_mensual,
+        'neto_anual': neto_anual,
+        'recoverable': recoverable,
+        'meses_para_recuperar': meses_para_recuperar,
+        'roi_days': roi_days,
+        'combustible_total': combustible_total,
+        'renta_mensual': renta_mensual,
+        'real_idle_percentage': porcentaje_ralenti_real,  # Valor del slider
+        'costo_ralenti_real_unit': costo_ralenti_real_unit,
+        'merma_diaria_real_unit': merma_diaria_real_unit,
+        'merma_semanal_real_unit': merma_semanal_real_unit,
+        'merma_mensual_real_unit': merma_mensual_real_unit,
+        'merma_anual_real_unit': merma_anual_real_unit,
+        'costo_ralenti_real_fleet': costo_ralenti_real_fleet,
+        'merma_diaria_real_fleet': merma_diaria_real_fleet,
+        'merma_semanal_real_fleet': merma_semanal_real_fleet,
+        'merma_mensual_real_fleet': merma_mensual_real_fleet,
+        'merma_anual_real_fleet': merma_anual_real_fleet,
+    }
+
+# Valores iniciales de session_state
+_SESSION_DEFAULTS = {
+    'calculado': False,
 
     # Variables de cálculo inicial
-    st.session_state.idle_minutes = 0
-    st.session_state.moving_minutes = 0
-    st.session_state.total_minutes = 0
-    st.session_state.idle_percentage = 0.0
-    st.session_state.moving_percentage = 0.0
-    st.session_state.combustible_ralenti = 0.0
-    st.session_state.combustible_movimiento = 0.0
-    st.session_state.costo_ralenti = 0.0
-    st.session_state.costo_movimiento = 0.0
-    st.session_state.costo_total = 0.0
-    st.session_state.merma_total = 0.0
-    st.session_state.merma_diaria = 0.0
-    st.session_state.merma_semanal = 0.0
-    st.session_state.merma_mensual = 0.0
-    st.session_state.merma_anual = 0.0
-    st.session_state.merma_total_unit = 0.0
-    st.session_state.merma_diaria_unit = 0.0
-    st.session_state.merma_semanal_unit = 0.0
-    st.session_state.merma_mensual_unit = 0.0
-    st.session_state.merma_anual_unit = 0.0
-    st.session_state.ahorro_anual = 0.0
-    st.session_state.costo_total_barras = 0.0
-    st.session_state.neto_mensual = 0.0
-    st.session_state.neto_anual = 0.0
-    st.session_state.ahorro_mensual = 0.0  # Asegurarse de que esté inicializado
-    st.session_state.meses_para_recuperar = 0.0
-    st.session_state.roi_days = 0.0
-    st.session_state.combustible_total = 0.0
-    st.session_state.real_idle_percentage = 100.0  # Valor inicial, ahora ajustable por el usuario
-    st.session_state.costo_ralenti_real_unit = 0.0
-    st.session_state.merma_diaria_real_unit = 0.0
-    st.session_state.merma_semanal_real_unit = 0.0
-    st.session_state.merma_mensual_real_unit = 0.0
-    st.session_state.merma_anual_real_unit = 0.0
-    st.session_state.costo_ralenti_real_fleet = 0.0
-    st.session_state.merma_diaria_real_fleet = 0.0
-    st.session_state.merma_semanal_real_fleet = 0.0
-    st.session_state.merma_mensual_real_fleet = 0.0
-    st.session_state.merma_anual_real_fleet = 0.0
-    st.session_state.renta_mensual = 999.00  # Valor por defecto
+    'idle_minutes': 0,
+    'moving_minutes': 0,
+    'total_minutes': 0,
+    'idle_percentage': 0.0,
+    'moving_percentage': 0.0,
+    'combustible_ralenti': 0.0,
+    'combustible_movimiento': 0.0,
+    'costo_ralenti': 0.0,
+    'costo_movimiento': 0.0,
+    'costo_total': 0.0,
+    'merma_total': 0.0,
+    'merma_diaria': 0.0,
+    'merma_semanal': 0.0,
+    'merma_mensual': 0.0,
+    'merma_anual': 0.0,
+    'merma_total_unit': 0.0,
+    'merma_diaria_unit': 0.0,
+    'merma_semanal_unit': 0.0,
+    'merma_mensual_unit': 0.0,
+    'merma_anual_unit': 0.0,
+    'ahorro_anual': 0.0,
+    'costo_total_barras': 0.0,
+    'neto_mensual': 0.0,
+    'neto_anual': 0.0,
+    'ahorro_mensual': 0.0,  # Asegurarse de que esté inicializado
+    'recoverable': False,
+    'meses_para_recuperar': 0.0,
+    'roi_days': 0.0,
+    'combustible_total': 0.0,
+    'real_idle_percentage': 100.0,  # Valor inicial, ahora ajustable por el usuario
+    'costo_ralenti_real_unit': 0.0,
+    'merma_diaria_real_unit': 0.0,
+    'merma_semanal_real_unit': 0.0,
+    'merma_mensual_real_unit': 0.0,
+    'merma_anual_real_unit': 0.0,
+    'costo_ralenti_real_fleet': 0.0,
+    'merma_diaria_real_fleet': 0.0,
+    'merma_semanal_real_fleet': 0.0,
+    'merma_mensual_real_fleet': 0.0,
+    'merma_anual_real_fleet': 0.0,
+    'renta_mensual': 999.00,  # Valor por defecto
+}
+
+# Inicializar variables en session_state si no existen
+for key, value in _SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
 
 # Configuración de la página
 st.set_page_config(page_title="Análisis de Ralentí vs Movimiento", layout="wide")
@@ -179,13 +749,78 @@ porcentaje_ralenti_real = st.sidebar.slider(
 
 st.sidebar.markdown("---")
 
-# Entrada de rango de fechas
-st.header("📅 Rango de Fechas de los Datos")
-col_date1, col_date2 = st.columns(2)
-with col_date1:
-    start_date = st.date_input("Fecha de Inicio", value=datetime.today())
-with col_date2:
-    end_date = st.date_input("Fecha de Fin", value=datetime.today())
+# Formulario de entrada: los widgets no provocan reruns hasta que se envía
+with st.form("calc_form"):
+    # Entrada de rango de fechas
+    st.header("📅 Rango de Fechas de los Datos")
+    col_date1, col_date2 = st.columns(2)
+    with col_date1:
+        start_date = st.date_input("Fecha de Inicio", value=datetime.today())
+    with col_date2:
+        end_date = st.date_input("Fecha de Fin", value=datetime.today())
+
+    st.markdown("---")
+
+    # Entrada de datos de tiempo
+    st.header("⏱️ Ingreso de Datos de Tiempo")
+    col1, col2 = st.columns(2)
+    with col1:
+        idle_time = st.text_area(
+            "⏱️ Tiempo en ralentí (formato: (XD, YH, ZM))",
+            placeholder="Ejemplo: (1D, 22H, 8M)",
+            help="Ingrese el tiempo en el formato especificado: D=días, H=horas, M=minutos"
+        )
+
+    with col2:
+        moving_time = st.text_area(
+            "🚗 Tiempo en movimiento (formato: (XD, YH, ZM))",
+            placeholder="Ejemplo: (1D, 15H, 32M)",
+            help="Ingrese el tiempo en el formato especificado: D=días, H=horas, M=minutos"
+        )
+
+    st.markdown("---")
+
+    # Entrada de combustible, precio y unidades de la flota
+    st.header("⛽ Ingreso de Datos de Combustible y Flota")
+    col3, col4, col5 = st.columns(3)
+    with col3:
+        combustible_total = st.number_input(
+            "⛽ Combustible total consumido por unidad (L)",
+            min_value=0.0,
+            value=1419.00,
+            step=0.1,
+            help="Ingrese el total de combustible consumido en litros por unidad"
+        )
+    with col4:
+        precio_litro = st.number_input(
+            "💲 Precio por litro ($)",
+            min_value=0.0,
+            value=25.00,
+            step=0.01,
+            help="Ingrese el precio por litro de combustible"
+        )
+    with col5:
+        num_unidades = st.number_input(
+            "🚛 Cantidad de unidades en la flota",
+            min_value=1,
+            value=30,
+            step=1,
+            help="Ingrese el número total de unidades en su flota"
+        )
+
+    # Vista de resultados: el análisis económico solo se calcula cuando se incluye
+    vista_resultados = st.radio(
+        "📑 Vista de resultados",
+        ["Operativo", "Operativo + Económico"],
+        index=1,
+        horizontal=True,
+        help="Omita el análisis económico para recalcular más rápido mientras ajusta los parámetros"
+    )
+
+    st.markdown("---")
+
+    # Botón para calcular
+    calcular_clicked = st.form_submit_button("✅ Calcular")
 
 # Validación de las fechas
 if start_date > end_date:
@@ -198,57 +833,7 @@ st.info(f"**Duración del Período**: {duration_days} días")
 
 st.markdown("---")
 
-# Entrada de datos de tiempo
-st.header("⏱️ Ingreso de Datos de Tiempo")
-col1, col2 = st.columns(2)
-with col1:
-    idle_time = st.text_area(
-        "⏱️ Tiempo en ralentí (formato: (XD, YH, ZM))",
-        placeholder="Ejemplo: (1D, 22H, 8M)",
-        help="Ingrese el tiempo en el formato especificado: D=días, H=horas, M=minutos"
-    )
-
-with col2:
-    moving_time = st.text_area(
-        "🚗 Tiempo en movimiento (formato: (XD, YH, ZM))",
-        placeholder="Ejemplo: (1D, 15H, 32M)",
-        help="Ingrese el tiempo en el formato especificado: D=días, H=horas, M=minutos"
-    )
-
-st.markdown("---")
-
-# Entrada de combustible, precio y unidades de la flota
-st.header("⛽ Ingreso de Datos de Combustible y Flota")
-col3, col4, col5 = st.columns(3)
-with col3:
-    combustible_total = st.number_input(
-        "⛽ Combustible total consumido por unidad (L)",
-        min_value=0.0,
-        value=1419.00,
-        step=0.1,
-        help="Ingrese el total de combustible consumido en litros por unidad"
-    )
-with col4:
-    precio_litro = st.number_input(
-        "💲 Precio por litro ($)",
-        min_value=0.0,
-        value=25.00,
-        step=0.01,
-        help="Ingrese el precio por litro de combustible"
-    )
-with col5:
-    num_unidades = st.number_input(
-        "🚛 Cantidad de unidades en la flota",
-        min_value=1,
-        value=30,
-        step=1,
-        help="Ingrese el número total de unidades en su flota"
-    )
-
-st.markdown("---")
-
-# Botón para calcular
-if st.button("✅ Calcular"):
+if calcular_clicked:
 
     # Validación de entradas de tiempo
     idle_minutes = parse_time_string(idle_time)
@@ -268,128 +853,26 @@ if st.button("✅ Calcular"):
         if total_minutes == 0:
             st.error("⚠️ El tiempo total no puede ser cero.")
         else:
-            # Cálculo de porcentajes de tiempo
-            idle_percentage = (idle_minutes / total_minutes) * 100
-            moving_percentage = (moving_minutes / total_minutes) * 100
-
-            # Cálculo de consumo de combustible proporcional
-            combustible_ralenti = (idle_percentage / 100) * combustible_total
-            combustible_movimiento = (moving_percentage / 100) * combustible_total
-
-            # Cálculo de costos
-            costo_ralenti = combustible_ralenti * precio_litro
-            costo_movimiento = combustible_movimiento * precio_litro
-            costo_total = combustible_total * precio_litro
-
-            # Cálculo de merma total por todas las unidades
-            merma_total = costo_ralenti * num_unidades
-
-            # Escalado de merma según la duración del período
-            merma_diaria = merma_total / duration_days
-            merma_semanal = merma_diaria * 7
-            merma_mensual = merma_diaria * 30
-            merma_anual = merma_diaria * 365
-
-            # Cálculo de merma por unidad
-            merma_total_unit = costo_ralenti
-            merma_diaria_unit = merma_total_unit / duration_days
-            merma_semanal_unit = merma_diaria_unit * 7
-            merma_mensual_unit = merma_diaria_unit * 30
-            merma_anual_unit = merma_diaria_unit * 365
-
-            # Cálculo del ahorro potencial con reducción de merma
-            # Incorporar el % de ralentí real
-            ahorro_anual = merma_anual * (porcentaje_reduccion / 100) * (porcentaje_ralenti_real / 100)
-
-            # Cálculo del costo total de las barras de combustible
-            costo_total_barras = costo_por_pieza * num_unidades
-
-            # Cálculo del ahorro mensual
-            ahorro_mensual = ahorro_anual / 12
-
-            # **[Corrección] Almacenar 'ahorro_mensual' en session_state**
-            st.session_state.ahorro_mensual = ahorro_mensual
-
-            # Cálculo del ahorro neto mensual (Ahorro mensual - Renta mensual total)
-            neto_mensual = ahorro_mensual - (renta_mensual * num_unidades)
-
-            # Cálculo del Retorno de Inversión (ROI) en meses
-            if neto_mensual > 0:
-                meses_para_recuperar = costo_total_barras / neto_mensual
-            else:
-                meses_para_recuperar = float('inf')  # No recuperable
+            # Calcular y almacenar los resultados en session_state con una sola actualización
+            st.session_state.update(calcular(
+                idle_minutes, moving_minutes, combustible_total, precio_litro, num_unidades,
+                duration_days, porcentaje_reduccion, porcentaje_ralenti_real, renta_mensual, costo_por_pieza
+            ))
+            st.session_state.calculado = True
 
-            # Cálculo del Retorno de Inversión (ROI) en días
-            if neto_mensual > 0:
-                ahorro_neto_diario = neto_mensual / 30  # Asumiendo 30 días por mes
-                roi_days = costo_total_barras / ahorro_neto_diario
-            else:
-                roi_days = float('inf')  # No recuperable
+        # Plotly se importa aquí para que la página inicial no pague su tiempo de carga
+        import plotly.graph_objects as go
 
-            # Cálculo del neto mensual y anual (ahorro - renta mensual total)
-            neto_anual = ahorro_anual - (renta_mensual * 12 * num_unidades)
-
-            # Almacenar los resultados en session_state
-            st.session_state.calculado = True
-            st.session_state.idle_minutes = idle_minutes
-            st.session_state.moving_minutes = moving_minutes
-            st.session_state.total_minutes = total_minutes
-            st.session_state.idle_percentage = idle_percentage
-            st.session_state.moving_percentage = moving_percentage
-            st.session_state.combustible_ralenti = combustible_ralenti
-            st.session_state.combustible_movimiento = combustible_movimiento
-            st.session_state.costo_ralenti = costo_ralenti
-            st.session_state.costo_movimiento = costo_movimiento
-            st.session_state.costo_total = costo_total
-            st.session_state.merma_total = merma_total
-            st.session_state.merma_diaria = merma_diaria
-            st.session_state.merma_semanal = merma_semanal
-            st.session_state.merma_mensual = merma_mensual
-            st.session_state.merma_anual = merma_anual
-            st.session_state.merma_total_unit = merma_total_unit
-            st.session_state.merma_diaria_unit = merma_diaria_unit
-            st.session_state.merma_semanal_unit = merma_semanal_unit
-            st.session_state.merma_mensual_unit = merma_mensual_unit
-            st.session_state.merma_anual_unit = merma_anual_unit
-            st.session_state.ahorro_anual = ahorro_anual
-            st.session_state.costo_total_barras = costo_total_barras
-            st.session_state.neto_mensual = neto_mensual  # Cambio: 'ahorro_neto_mensual' ya no se usa
-            st.session_state.neto_anual = neto_anual
-            st.session_state.meses_para_recuperar = meses_para_recuperar
-            st.session_state.roi_days = roi_days  # Almacenar ROI en días
-            st.session_state.combustible_total = combustible_total
-            st.session_state.renta_mensual = renta_mensual  # Actualizar renta_mensual
-
-            # Actualizar el porcentaje de ralentí real con el valor del slider
-            st.session_state.real_idle_percentage = porcentaje_ralenti_real
-
-            # Cálculos Real Ralentí (usando el porcentaje ajustado por el usuario)
-            costo_ralenti_real_unit = st.session_state.costo_ralenti * (st.session_state.real_idle_percentage / 100)
-            merma_total_real_unit = costo_ralenti_real_unit
-            merma_diaria_real_unit = merma_total_real_unit / duration_days
-            merma_semanal_real_unit = merma_diaria_real_unit * 7
-            merma_mensual_real_unit = merma_diaria_real_unit * 30
-            merma_anual_real_unit = merma_diaria_real_unit * 365
-
-            # Cálculos Real Ralentí para Flota
-            costo_ralenti_real_fleet = costo_ralenti_real_unit * num_unidades
-            merma_total_real_fleet = costo_ralenti_real_fleet
-            merma_diaria_real_fleet = merma_total_real_fleet / duration_days
-            merma_semanal_real_fleet = merma_diaria_real_fleet * 7
-            merma_mensual_real_fleet = merma_diaria_real_fleet * 30
-            merma_anual_real_fleet = merma_diaria_real_fleet * 365
-
-            # Actualizar session_state con los cálculos real ralenti
-            st.session_state.costo_ralenti_real_unit = costo_ralenti_real_unit
-            st.session_state.merma_diaria_real_unit = merma_diaria_real_unit
-            st.session_state.merma_semanal_real_unit = merma_semanal_real_unit
-            st.session_state.merma_mensual_real_unit = merma_mensual_real_unit
-            st.session_state.merma_anual_real_unit = merma_anual_real_unit
-            st.session_state.costo_ralenti_real_fleet = costo_ralenti_real_fleet
-            st.session_state.merma_diaria_real_fleet = merma_diaria_real_fleet
-            st.session_state.merma_semanal_real_fleet = merma_semanal_real_fleet
-            st.session_state.merma_mensual_real_fleet = merma_mensual_real_fleet
-            st.session_state.merma_anual_real_fleet = merma_anual_real_fleet
+        # Totales de la flota usados en varias pestañas (se calculan una sola vez)
+        costo_ralenti_fleet = st.session_state.costo_ralenti * num_unidades
+        costo_movimiento_fleet = st.session_state.costo_movimiento * num_unidades
+        costo_total_fleet = st.session_state.costo_total * num_unidades
+        combustible_ralenti_fleet = st.session_state.combustible_ralenti * num_unidades
+        combustible_movimiento_fleet = st.session_state.combustible_movimiento * num_unidades
+        combustible_total_fleet = st.session_state.combustible_total * num_unidades
+        idle_minutes_fleet = st.session_state.idle_minutes * num_unidades
+        moving_minutes_fleet = st.session_state.moving_minutes * num_unidades
+        total_minutes_fleet = st.session_state.total_minutes * num_unidades
 
         # Definir las pestañas (Renombradas)
         tabs = st.tabs(["📦 Unidad Individual", "🚛 Flota Completa", "🔍 Detalles de Cálculos", "Datos Recopilados", "💡 Análisis Económico"])
@@ -397,159 +880,63 @@ if st.button("✅ Calcular"):
         # Pestaña 1: Unidad Individual
         with tabs[0]:
             st.subheader("📈 Resumen de Análisis - Unidad Individual")
-            data_unit = {
-                'Concepto': ['Ralentí Real', 'Movimiento', 'Total'],
-                'Tiempo (min)': [st.session_state.idle_minutes, st.session_state.moving_minutes, st.session_state.total_minutes],
-                'Tiempo (hrs)': [round(st.session_state.idle_minutes / 60, 2), round(st.session_state.moving_minutes / 60, 2), round(st.session_state.total_minutes / 60, 2)],
-                'Porcentaje Tiempo': [round(st.session_state.idle_percentage, 1), round(st.session_state.moving_percentage, 1), 100.0],
-                'Consumo Combustible (L)': [round(st.session_state.combustible_ralenti, 2), round(st.session_state.combustible_movimiento, 2), round(st.session_state.combustible_total, 2)],
-                'Costo ($)': [st.session_state.costo_ralenti, st.session_state.costo_movimiento, st.session_state.costo_total]
-            }
-            df_unit = pd.DataFrame(data_unit)
-
-            st.dataframe(df_unit.style
-                .format({
-                    'Tiempo (min)': '{:,.0f}',
-                    'Tiempo (hrs)': '{:,.2f}',
-                    'Porcentaje Tiempo': '{:,.1f}%',
-                    'Consumo Combustible (L)': '{:,.2f}',
-                    'Costo ($)': '${:,.2f}'
-                })
-                .apply(color_merma, axis=1)
+            df_unit = build_unit_df(
+                st.session_state.idle_minutes, st.session_state.moving_minutes, st.session_state.total_minutes,
+                st.session_state.idle_percentage, st.session_state.moving_percentage,
+                st.session_state.combustible_ralenti, st.session_state.combustible_movimiento, st.session_state.combustible_total,
+                st.session_state.costo_ralenti, st.session_state.costo_movimiento, st.session_state.costo_total
             )
 
+            st.dataframe(format_summary_df(df_unit).style.apply(color_merma, axis=None))
+
             # Visualizaciones para Unidad
             col6, col7 = st.columns(2)
             with col6:
                 st.markdown("### 🕒 Distribución del Tiempo - Unidad")
-                fig_tiempo_unit = px.bar(
-                    df_unit[df_unit['Concepto'] != 'Total'],
-                    x='Concepto',
-                    y='Tiempo (min)',
-                    title='Distribución del Tiempo: Ralentí vs Movimiento',
-                    labels={'Tiempo (min)': 'Tiempo (min)', 'Concepto': 'Actividad'},
-                    color='Concepto',
-                    color_discrete_sequence=['#28a745', '#66B2FF'],  # Verde para Ralentí Real y azul para Movimiento
-                    text='Tiempo (min)',
-                    hover_data={'Consumo Combustible (L)': True, 'Costo ($)': True}
-                )
-                fig_tiempo_unit.update_traces(
-                    texttemplate='%{y:,.0f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_tiempo_unit.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='Actividad',
-                    yaxis_title='Tiempo (min)',
-                    font=dict(size=12),
-                    hovermode='closest'  # Mostrar solo el trazo más cercano
+                fig_tiempo_unit = build_distribucion_fig(
+                    *distribucion_inputs(df_unit), 'Tiempo (min)', 'Distribución del Tiempo: Ralentí vs Movimiento'
                 )
                 st.plotly_chart(fig_tiempo_unit, use_container_width=True)
 
             with col7:
                 st.markdown("### 💰 Distribución del Costo - Unidad")
-                fig_costo_unit = px.bar(
-                    df_unit[df_unit['Concepto'] != 'Total'],
-                    x='Concepto',
-                    y='Costo ($)',
-                    title='Distribución del Costo: Ralentí vs Movimiento',
-                    labels={'Costo ($)': 'Costo ($)', 'Concepto': 'Actividad'},
-                    color='Concepto',
-                    color_discrete_sequence=['#28a745', '#66B2FF'],  # Verde para Ralentí Real y azul para Movimiento
-                    text='Costo ($)',
-                    hover_data={'Tiempo (min)': True, 'Consumo Combustible (L)': True}
-                )
-                fig_costo_unit.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_costo_unit.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='Actividad',
-                    yaxis_title='Costo ($)',
-                    font=dict(size=12),
-                    hovermode='closest'  # Mostrar solo el trazo más cercano
+                fig_costo_unit = build_distribucion_fig(
+                    *distribucion_inputs(df_unit), 'Costo ($)', 'Distribución del Costo: Ralentí vs Movimiento'
                 )
                 st.plotly_chart(fig_costo_unit, use_container_width=True)
 
             # Métricas Clave por Unidad con "Cards"
             st.subheader("📊 Métricas Clave - Unidad Individual")
-            col8, col9, col10, col11 = st.columns(4)
-
-            with col8:
-                create_metric_card(
-                    title="💸 Merma Diaria",
-                    value=f"${st.session_state.merma_diaria_unit:,.2f}",
-                    subtitle="Merma diaria por unidad",
-                    color="#FF6666"
-                )
-            with col9:
-                create_metric_card(
-                    title="💸 Merma Semanal",
-                    value=f"${st.session_state.merma_semanal_unit:,.2f}",
-                    subtitle="Merma semanal por unidad",
-                    color="#FF6666"
-                )
-            with col10:
-                create_metric_card(
-                    title="💸 Merma Mensual",
-                    value=f"${st.session_state.merma_mensual_unit:,.2f}",
-                    subtitle="Merma mensual por unidad",
-                    color="#FF6666"
-                )
-            with col11:
-                create_metric_card(
-                    title="💸 Merma Anual",
-                    value=f"${st.session_state.merma_anual_unit:,.2f}",
-                    subtitle="Merma anual por unidad",
-                    color="#FF6666"
-                )
+            render_cards([
+                {"title": "💸 Merma Diaria", "value": _CURRENCY(st.session_state.merma_diaria_unit), "subtitle": "Merma diaria por unidad", "color": "#FF6666"},
+                {"title": "💸 Merma Semanal", "value": _CURRENCY(st.session_state.merma_semanal_unit), "subtitle": "Merma semanal por unidad", "color": "#FF6666"},
+                {"title": "💸 Merma Mensual", "value": _CURRENCY(st.session_state.merma_mensual_unit), "subtitle": "Merma mensual por unidad", "color": "#FF6666"},
+                {"title": "💸 Merma Anual", "value": _CURRENCY(st.session_state.merma_anual_unit), "subtitle": "Merma anual por unidad", "color": "#FF6666"}
+            ])
 
             st.markdown("---")
 
             # Detalles de las métricas clave
             st.subheader("🔍 Detalles de las Métricas Clave - Unidad Individual")
-            col12, col13, col14 = st.columns(3)
-
-            with col12:
-                create_metric_card(
-                    title="Ralentí (MERMA)",
-                    value=f"${st.session_state.costo_ralenti:,.2f}",
-                    subtitle=f"{st.session_state.combustible_ralenti:.1f} L ({st.session_state.idle_percentage:.1f}%)",
-                    color="#FF6666"
-                )
-            with col13:
-                create_metric_card(
-                    title="Movimiento",
-                    value=f"${st.session_state.costo_movimiento:,.2f}",
-                    subtitle=f"{st.session_state.combustible_movimiento:.1f} L ({st.session_state.moving_percentage:.1f}%)",
-                    color="#66B2FF"
-                )
-            with col14:
-                create_metric_card(
-                    title="Total",
-                    value=f"${st.session_state.costo_total:,.2f}",
-                    subtitle=f"{st.session_state.combustible_total:.1f} L (100%)",
-                    color="#28a745"
-                )
+            render_cards([
+                {"title": "Ralentí (MERMA)", "value": _CURRENCY(st.session_state.costo_ralenti), "subtitle": f"{st.session_state.combustible_ralenti:.1f} L ({_PCT(st.session_state.idle_percentage)})", "color": "#FF6666"},
+                {"title": "Movimiento", "value": _CURRENCY(st.session_state.costo_movimiento), "subtitle": f"{st.session_state.combustible_movimiento:.1f} L ({_PCT(st.session_state.moving_percentage)})", "color": "#66B2FF"},
+                {"title": "Total", "value": _CURRENCY(st.session_state.costo_total), "subtitle": f"{st.session_state.combustible_total:.1f} L (100%)", "color": "#28a745"}
+            ])
 
             # Mensaje de alerta sobre la merma
-            st.warning(f"⚠️ **MERMA POR RALENTÍ:** ${st.session_state.costo_ralenti:,.2f} - Este monto representa pérdidas por tiempo en ralentí excesivo")
+            st.warning(f"⚠️ **MERMA POR RALENTÍ:** {_CURRENCY(st.session_state.costo_ralenti)} - Este monto representa pérdidas por tiempo en ralentí excesivo")
 
             # Sección de Beneficios Clave
             st.markdown("---")
             st.subheader("🎯 **Beneficios Clave de Implementar Nuestro Servicio**")
 
-            benefits = [
-                {"icon": "💰", "title": "Reducción de Costos", "description": "Disminuye los gastos en combustible al optimizar el tiempo en ralentí."},
-                {"icon": "📉", "title": "Ahorro Continuo", "description": "Genera ahorros mensuales y anuales significativos."},
-                {"icon": "⏳", "title": "Retorno de Inversión Rápido", "description": f"Recupera tu inversión en {round(st.session_state.meses_para_recuperar, 2)} meses ({round(st.session_state.roi_days, 2)} días)." if st.session_state.meses_para_recuperar != float('inf') else "No es recuperable con el ahorro actual."},
-                {"icon": "🔧", "title": "Mejora Operativa", "description": "Optimiza el uso de combustible y mejora la eficiencia de tu flota."},
-            ]
+            if st.session_state.recoverable:
+                roi_description = f"Recupera tu inversión en {round(st.session_state.meses_para_recuperar, 2)} meses ({round(st.session_state.roi_days, 2)} días)."
+            else:
+                roi_description = "No es recuperable con el ahorro actual."
+            roi_benefit = {"icon": "⏳", "title": "Retorno de Inversión Rápido", "description": roi_description}
+            benefits = _BENEFITS_STATIC[:2] + [roi_benefit] + _BENEFITS_STATIC[2:]
 
             cols_benefits = st.columns(len(benefits))
             for idx, benefit in enumerate(benefits):
@@ -560,148 +947,47 @@ if st.button("✅ Calcular"):
         # Pestaña 2: Flota Completa
         with tabs[1]:
             st.subheader("🚛 Resumen de Análisis - Flota Completa")
-            data_fleet = {
-                'Concepto': ['Ralentí Real', 'Movimiento', 'Total'],
-                'Tiempo (min)': [st.session_state.idle_minutes * num_unidades, st.session_state.moving_minutes * num_unidades, st.session_state.total_minutes * num_unidades],
-                'Tiempo (hrs)': [round(st.session_state.idle_minutes / 60 * num_unidades, 2), round(st.session_state.moving_minutes / 60 * num_unidades, 2), round(st.session_state.total_minutes / 60 * num_unidades, 2)],
-                'Porcentaje Tiempo': [round(st.session_state.idle_percentage, 1), round(st.session_state.moving_percentage, 1), 100.0],
-                'Consumo Combustible (L)': [round(st.session_state.combustible_ralenti * num_unidades, 2), round(st.session_state.combustible_movimiento * num_unidades, 2), round(st.session_state.combustible_total * num_unidades, 2)],
-                'Costo ($)': [st.session_state.costo_ralenti * num_unidades, st.session_state.costo_movimiento * num_unidades, st.session_state.costo_total * num_unidades]
-            }
-            df_fleet = pd.DataFrame(data_fleet)
-
-            st.dataframe(df_fleet.style
-                .format({
-                    'Tiempo (min)': '{:,.0f}',
-                    'Tiempo (hrs)': '{:,.2f}',
-                    'Porcentaje Tiempo': '{:,.1f}%',
-                    'Consumo Combustible (L)': '{:,.2f}',
-                    'Costo ($)': '${:,.2f}'
-                })
-                .apply(color_merma, axis=1)
-            )
+            df_fleet = build_fleet_df(df_unit, num_unidades)
+
+            st.dataframe(format_summary_df(df_fleet).style.apply(color_merma, axis=None))
 
             # Visualizaciones para Flota
             col6_fleet, col7_fleet = st.columns(2)
             with col6_fleet:
                 st.markdown("### 🕒 Distribución del Tiempo - Flota")
-                fig_tiempo_fleet = px.bar(
-                    df_fleet[df_fleet['Concepto'] != 'Total'],
-                    x='Concepto',
-                    y='Tiempo (min)',
-                    title='Distribución del Tiempo: Ralentí vs Movimiento',
-                    labels={'Tiempo (min)': 'Tiempo (min)', 'Concepto': 'Actividad'},
-                    color='Concepto',
-                    color_discrete_sequence=['#28a745', '#66B2FF'],  # Verde para Ralentí Real y azul para Movimiento
-                    text='Tiempo (min)',
-                    hover_data={'Consumo Combustible (L)': True, 'Costo ($)': True}
-                )
-                fig_tiempo_fleet.update_traces(
-                    texttemplate='%{y:,.0f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_tiempo_fleet.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='Actividad',
-                    yaxis_title='Tiempo (min)',
-                    font=dict(size=12),
-                    hovermode='closest'  # Mostrar solo el trazo más cercano
+                fig_tiempo_fleet = build_distribucion_fig(
+                    *distribucion_inputs(df_fleet), 'Tiempo (min)', 'Distribución del Tiempo: Ralentí vs Movimiento'
                 )
                 st.plotly_chart(fig_tiempo_fleet, use_container_width=True)
 
             with col7_fleet:
                 st.markdown("### 💰 Distribución del Costo - Flota")
-                fig_costo_fleet = px.bar(
-                    df_fleet[df_fleet['Concepto'] != 'Total'],
-                    x='Concepto',
-                    y='Costo ($)',
-                    title='Distribución del Costo: Ralentí vs Movimiento',
-                    labels={'Costo ($)': 'Costo ($)', 'Concepto': 'Actividad'},
-                    color='Concepto',
-                    color_discrete_sequence=['#28a745', '#66B2FF'],  # Verde para Ralentí Real y azul para Movimiento
-                    text='Costo ($)',
-                    hover_data={'Tiempo (min)': True, 'Consumo Combustible (L)': True}
-                )
-                fig_costo_fleet.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_costo_fleet.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='Actividad',
-                    yaxis_title='Costo ($)',
-                    font=dict(size=12),
-                    hovermode='closest'  # Mostrar solo el trazo más cercano
+                fig_costo_fleet = build_distribucion_fig(
+                    *distribucion_inputs(df_fleet), 'Costo ($)', 'Distribución del Costo: Ralentí vs Movimiento'
                 )
                 st.plotly_chart(fig_costo_fleet, use_container_width=True)
 
             # Métricas Clave para Flota con "Cards"
             st.subheader("📊 Métricas Clave - Flota Completa")
-            col8_fleet, col9_fleet, col10_fleet, col11_fleet = st.columns(4)
-
-            with col8_fleet:
-                create_metric_card(
-                    title="💸 Merma Diaria Total",
-                    value=f"${st.session_state.merma_diaria:,.2f}",
-                    subtitle="Merma diaria total de la flota",
-                    color="#FF6666"
-                )
-            with col9_fleet:
-                create_metric_card(
-                    title="💸 Merma Semanal Total",
-                    value=f"${st.session_state.merma_semanal:,.2f}",
-                    subtitle="Merma semanal total de la flota",
-                    color="#FF6666"
-                )
-            with col10_fleet:
-                create_metric_card(
-                    title="💸 Merma Mensual Total",
-                    value=f"${st.session_state.merma_mensual:,.2f}",
-                    subtitle="Merma mensual total de la flota",
-                    color="#FF6666"
-                )
-            with col11_fleet:
-                create_metric_card(
-                    title="💸 Merma Anual Total",
-                    value=f"${st.session_state.merma_anual:,.2f}",
-                    subtitle="Merma anual total de la flota",
-                    color="#FF6666"
-                )
+            render_cards([
+                {"title": "💸 Merma Diaria Total", "value": _CURRENCY(st.session_state.merma_diaria), "subtitle": "Merma diaria total de la flota", "color": "#FF6666"},
+                {"title": "💸 Merma Semanal Total", "value": _CURRENCY(st.session_state.merma_semanal), "subtitle": "Merma semanal total de la flota", "color": "#FF6666"},
+                {"title": "💸 Merma Mensual Total", "value": _CURRENCY(st.session_state.merma_mensual), "subtitle": "Merma mensual total de la flota", "color": "#FF6666"},
+                {"title": "💸 Merma Anual Total", "value": _CURRENCY(st.session_state.merma_anual), "subtitle": "Merma anual total de la flota", "color": "#FF6666"}
+            ])
 
             st.markdown("---")
 
             # Detalles de las métricas clave
             st.subheader("🔍 Detalles de las Métricas Clave - Flota Completa")
-            col12_fleet, col13_fleet, col14_fleet = st.columns(3)
-
-            with col12_fleet:
-                create_metric_card(
-                    title="Ralentí (MERMA)",
-                    value=f"${st.session_state.costo_ralenti * num_unidades:,.2f}",
-                    subtitle=f"{st.session_state.combustible_ralenti * num_unidades:.1f} L ({st.session_state.idle_percentage:.1f}%)",
-                    color="#FF6666"
-                )
-            with col13_fleet:
-                create_metric_card(
-                    title="Movimiento",
-                    value=f"${st.session_state.costo_movimiento * num_unidades:,.2f}",
-                    subtitle=f"{st.session_state.combustible_movimiento * num_unidades:.1f} L ({st.session_state.moving_percentage:.1f}%)",
-                    color="#66B2FF"
-                )
-            with col14_fleet:
-                create_metric_card(
-                    title="Total",
-                    value=f"${st.session_state.costo_total * num_unidades:,.2f}",
-                    subtitle=f"{st.session_state.combustible_total * num_unidades:.1f} L (100%)",
-                    color="#28a745"
-                )
+            render_cards([
+                {"title": "Ralentí (MERMA)", "value": _CURRENCY(costo_ralenti_fleet), "subtitle": f"{combustible_ralenti_fleet:.1f} L ({_PCT(st.session_state.idle_percentage)})", "color": "#FF6666"},
+                {"title": "Movimiento", "value": _CURRENCY(costo_movimiento_fleet), "subtitle": f"{combustible_movimiento_fleet:.1f} L ({_PCT(st.session_state.moving_percentage)})", "color": "#66B2FF"},
+                {"title": "Total", "value": _CURRENCY(costo_total_fleet), "subtitle": f"{combustible_total_fleet:.1f} L (100%)", "color": "#28a745"}
+            ])
 
             # Mensaje de alerta sobre la merma
-            st.warning(f"⚠️ **MERMA POR RALENTÍ (Flota)**: ${st.session_state.costo_ralenti * num_unidades:,.2f} - Este monto representa pérdidas por tiempo en ralentí excesivo")
+            st.warning(f"⚠️ **MERMA POR RALENTÍ (Flota)**: {_CURRENCY(costo_ralenti_fleet)} - Este monto representa pérdidas por tiempo en ralentí excesivo")
 
             st.markdown("---")
 
@@ -712,54 +998,12 @@ if st.button("✅ Calcular"):
 
             with col19:
                 st.markdown("**Merma Diaria Real**")
-                fig_diaria_real = px.bar(
-                    x=["Diaria"],
-                    y=[st.session_state.merma_diaria_real_unit],
-                    labels={'x': '', 'y': 'Merma ($)'},
-                    title='Merma Diaria Real - Unidad',
-                    text=[f"${st.session_state.merma_diaria_real_unit:,.2f}"],
-                    color_discrete_sequence=['#28a745']
-                )
-                fig_diaria_real.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_diaria_real.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='',
-                    yaxis_title='Merma ($)',
-                    font=dict(size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
+                fig_diaria_real = build_merma_real_fig('Diaria', st.session_state.merma_diaria_real_unit, 'Merma Diaria Real - Unidad', '#28a745')
                 st.plotly_chart(fig_diaria_real, use_container_width=True)
 
             with col20:
                 st.markdown("**Merma Anual Real**")
-                fig_anual_real = px.bar(
-                    x=["Anual"],
-                    y=[st.session_state.merma_anual_real_unit],
-                    labels={'x': '', 'y': 'Merma ($)'},
-                    title='Merma Anual Real - Unidad',
-                    text=[f"${st.session_state.merma_anual_real_unit:,.2f}"],
-                    color_discrete_sequence=['#66B2FF']
-                )
-                fig_anual_real.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_anual_real.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='',
-                    yaxis_title='Merma ($)',
-                    font=dict(size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
+                fig_anual_real = build_merma_real_fig('Anual', st.session_state.merma_anual_real_unit, 'Merma Anual Real - Unidad', '#66B2FF')
                 st.plotly_chart(fig_anual_real, use_container_width=True)
 
             st.markdown("---")
@@ -779,54 +1023,12 @@ if st.button("✅ Calcular"):
 
             with col21:
                 st.markdown("**Merma Diaria Real Total**")
-                fig_diaria_real_fleet = px.bar(
-                    x=["Diaria"],
-                    y=[st.session_state.merma_diaria_real_fleet],
-                    labels={'x': '', 'y': 'Merma ($)'},
-                    title='Merma Diaria Real Total - Flota',
-                    text=[f"${st.session_state.merma_diaria_real_fleet:,.2f}"],
-                    color_discrete_sequence=['#28a745']
-                )
-                fig_diaria_real_fleet.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_diaria_real_fleet.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='',
-                    yaxis_title='Merma ($)',
-                    font=dict(size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
+                fig_diaria_real_fleet = build_merma_real_fig('Diaria', st.session_state.merma_diaria_real_fleet, 'Merma Diaria Real Total - Flota', '#28a745')
                 st.plotly_chart(fig_diaria_real_fleet, use_container_width=True)
 
             with col22:
                 st.markdown("**Merma Anual Real Total**")
-                fig_anual_real_fleet = px.bar(
-                    x=["Anual"],
-                    y=[st.session_state.merma_anual_real_fleet],
-                    labels={'x': '', 'y': 'Merma ($)'},
-                    title='Merma Anual Real Total - Flota',
-                    text=[f"${st.session_state.merma_anual_real_fleet:,.2f}"],
-                    color_discrete_sequence=['#66B2FF']
-                )
-                fig_anual_real_fleet.update_traces(
-                    texttemplate='$%{y:,.2f}',
-                    textposition='outside',
-                    textfont_color='green'  # Texto en verde
-                )
-                fig_anual_real_fleet.update_layout(
-                    uniformtext_minsize=8,
-                    uniformtext_mode='hide',
-                    xaxis_title='',
-                    yaxis_title='Merma ($)',
-                    font=dict(size=12),
-                    plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
+                fig_anual_real_fleet = build_merma_real_fig('Anual', st.session_state.merma_anual_real_fleet, 'Merma Anual Real Total - Flota', '#66B2FF')
                 st.plotly_chart(fig_anual_real_fleet, use_container_width=True)
 
             st.markdown("---")
@@ -862,95 +1064,32 @@ if st.button("✅ Calcular"):
             st.markdown("## 📦 Unidad Individual")
             
             # Crear columnas para métricas principales
-            col1_unit, col2_unit, col3_unit = st.columns(3)
-            
-            with col1_unit:
-                create_metric_card(
-                    title="⏱️ Tiempo Total",
-                    value=f"{st.session_state.total_minutes:,} min",
-                    subtitle="Tiempo total registrado",
-                    color="#28a745"
-                )
-            
-            with col2_unit:
-                create_metric_card(
-                    title="⛽ Consumo Total",
-                    value=f"{st.session_state.combustible_total:.2f} L",
-                    subtitle="Consumo total de combustible",
-                    color="#66B2FF"
-                )
-            
-            with col3_unit:
-                create_metric_card(
-                    title="💰 Costo Total",
-                    value=f"${st.session_state.costo_total:,.2f}",
-                    subtitle="Costo total operativo",
-                    color="#FF6666"
-                )
+            render_cards([
+                {"title": "⏱️ Tiempo Total", "value": f"{st.session_state.total_minutes:,} min", "subtitle": "Tiempo total registrado", "color": "#28a745"},
+                {"title": "⛽ Consumo Total", "value": f"{st.session_state.combustible_total:.2f} L", "subtitle": "Consumo total de combustible", "color": "#66B2FF"},
+                {"title": "💰 Costo Total", "value": _CURRENCY(st.session_state.costo_total), "subtitle": "Costo total operativo", "color": "#FF6666"}
+            ])
             
             st.markdown("### 📊 Desglose Detallado - Unidad Individual")
             
-            # Crear DataFrame para unidad individual con colores
-            data_recopilados_unit = {
-                'Concepto': [
-                    '⏱️ Tiempo en Ralentí',
-                    '🚗 Tiempo en Movimiento',
-                    '⌛ Tiempo Total',
-                    '🔥 Consumo en Ralentí',
-                    '⛽ Consumo en Movimiento',
-                    '📊 Consumo Total',
-                    '💸 Costo en Ralentí (100%)',
-                    '💰 Costo en Ralentí Real',
-                    '🚛 Costo en Movimiento',
-                    '💵 Costo Total',
-                    '📉 Merma Diaria Real',
-                    '📊 Merma Semanal Real',
-                    '📈 Merma Mensual Real',
-                    '💹 Merma Anual Real'
-                ],
-                'Valor': [
-                    f"{st.session_state.idle_minutes:,} min",
-                    f"{st.session_state.moving_minutes:,} min",
-                    f"{st.session_state.total_minutes:,} min",
-                    f"{st.session_state.combustible_ralenti:.2f} L",
-                    f"{st.session_state.combustible_movimiento:.2f} L",
-                    f"{st.session_state.combustible_total:.2f} L",
-                    f"${st.session_state.costo_ralenti:,.2f}",
-                    f"${st.session_state.costo_ralenti_real_unit:,.2f}",
-                    f"${st.session_state.costo_movimiento:,.2f}",
-                    f"${st.session_state.costo_total:,.2f}",
-                    f"${st.session_state.merma_diaria_real_unit:,.2f}",
-                    f"${st.session_state.merma_semanal_real_unit:,.2f}",
-                    f"${st.session_state.merma_mensual_real_unit:,.2f}",
-                    f"${st.session_state.merma_anual_real_unit:,.2f}"
-                ]
-            }
-            df_recopilados_unit = pd.DataFrame(data_recopilados_unit)
-            
-            # Aplicar estilo personalizado a la tabla
-            def style_dataframe(df):
-                return df.style\
-                    .apply(color_merma, axis=1)\
-                    .set_properties(**{
-                        'background-color': '#f8f9fa',
-                        'color': '#212529',
-                        'border': '1px solid #dee2e6',
-                        'padding': '0.75rem',
-                        'font-size': '1rem'
-                    })\
-                    .set_table_styles([
-                        {'selector': 'th', 'props': [
-                            ('background-color', '#28a745'),
-                            ('color', 'white'),
-                            ('font-weight', 'bold'),
-                            ('text-align', 'center')
-                        ]},
-                        {'selector': 'td', 'props': [
-                            ('text-align', 'left')
-                        ]}
-                    ])
-            
-            st.dataframe(style_dataframe(df_recopilados_unit), use_container_width=True)
+            # Desglose detallado para unidad individual (tabla estática, sin DataFrame)
+            valores_unit = [
+                f"{st.session_state.idle_minutes:,} min",
+                f"{st.session_state.moving_minutes:,} min",
+                f"{st.session_state.total_minutes:,} min",
+                f"{st.session_state.combustible_ralenti:.2f} L",
+                f"{st.session_state.combustible_movimiento:.2f} L",
+                f"{st.session_state.combustible_total:.2f} L",
+                _CURRENCY(st.session_state.costo_ralenti),
+                _CURRENCY(st.session_state.costo_ralenti_real_unit),
+                _CURRENCY(st.session_state.costo_movimiento),
+                _CURRENCY(st.session_state.costo_total),
+                _CURRENCY(st.session_state.merma_diaria_real_unit),
+                _CURRENCY(st.session_state.merma_semanal_real_unit),
+                _CURRENCY(st.session_state.merma_mensual_real_unit),
+                _CURRENCY(st.session_state.merma_anual_real_unit)
+            ]
+            render_detail_table([{'Concepto': c, 'Valor': v} for c, v in zip(_DETALLE_CONCEPTOS, valores_unit)])
             
             st.markdown("---")
             
@@ -958,71 +1097,32 @@ if st.button("✅ Calcular"):
             st.markdown("## 🚛 Flota Completa")
             
             # Crear columnas para métricas principales de flota
-            col1_fleet, col2_fleet, col3_fleet = st.columns(3)
-            
-            with col1_fleet:
-                create_metric_card(
-                    title="⏱️ Tiempo Total Flota",
-                    value=f"{st.session_state.total_minutes * num_unidades:,} min",
-                    subtitle="Tiempo total de la flota",
-                    color="#28a745"
-                )
-            
-            with col2_fleet:
-                create_metric_card(
-                    title="⛽ Consumo Total Flota",
-                    value=f"{st.session_state.combustible_total * num_unidades:.2f} L",
-                    subtitle="Consumo total de la flota",
-                    color="#66B2FF"
-                )
-            
-            with col3_fleet:
-                create_metric_card(
-                    title="💰 Costo Total Flota",
-                    value=f"${st.session_state.costo_total * num_unidades:,.2f}",
-                    subtitle="Costo total de la flota",
-                    color="#FF6666"
-                )
+            render_cards([
+                {"title": "⏱️ Tiempo Total Flota", "value": f"{total_minutes_fleet:,} min", "subtitle": "Tiempo total de la flota", "color": "#28a745"},
+                {"title": "⛽ Consumo Total Flota", "value": f"{combustible_total_fleet:.2f} L", "subtitle": "Consumo total de la flota", "color": "#66B2FF"},
+                {"title": "💰 Costo Total Flota", "value": _CURRENCY(costo_total_fleet), "subtitle": "Costo total de la flota", "color": "#FF6666"}
+            ])
             
             st.markdown("### 📊 Desglose Detallado - Flota Completa")
             
-            # Crear DataFrame para flota completa con colores
-            data_recopilados_fleet = {
-                'Concepto': [
-                    '⏱️ Tiempo en Ralentí',
-                    '🚗 Tiempo en Movimiento',
-                    '⌛ Tiempo Total',
-                    '🔥 Consumo en Ralentí',
-                    '⛽ Consumo en Movimiento',
-                    '📊 Consumo Total',
-                    '💸 Costo en Ralentí (100%)',
-                    '💰 Costo en Ralentí Real',
-                    '🚛 Costo en Movimiento',
-                    '💵 Costo Total',
-                    '📉 Merma Diaria Real',
-                    '📊 Merma Semanal Real',
-                    '📈 Merma Mensual Real',
-                    '💹 Merma Anual Real'
-                ],
-                'Valor': [
-                    f"{st.session_state.idle_minutes * num_unidades:,} min",
-                    f"{st.session_state.moving_minutes * num_unidades:,} min",
-                    f"{st.session_state.total_minutes * num_unidades:,} min",
-                    f"{st.session_state.combustible_ralenti * num_unidades:.2f} L",
-                    f"{st.session_state.combustible_movimiento * num_unidades:.2f} L",
-                    f"{st.session_state.combustible_total * num_unidades:.2f} L",
-                    f"${st.session_state.costo_ralenti * num_unidades:,.2f}",
-                    f"${st.session_state.costo_ralenti_real_fleet:,.2f}",
-                    f"${st.session_state.costo_movimiento * num_unidades:,.2f}",
-                    f"${st.session_state.costo_total * num_unidades:,.2f}",
-                    f"${st.session_state.merma_diaria_real_fleet:,.2f}",
-                    f"${st.session_state.merma_semanal_real_fleet:,.2f}",
-                    f"${st.session_state.merma_mensual_real_fleet:,.2f}",
-                    f"${st.session_state.merma_anual_real_fleet:,.2f}"
-                ]
-            }
-            df_recopilados_fleet = pd.DataFrame(data_recopilados_fleet)
-            st.dataframe(style_dataframe(df_recopilados_fleet), use_container_width=True)
+            # Desglose detallado para flota completa (tabla estática, sin DataFrame)
+            valores_fleet = [
+                f"{idle_minutes_fleet:,} min",
+                f"{moving_minutes_fleet:,} min",
+                f"{total_minutes_fleet:,} min",
+                f"{combustible_ralenti_fleet:.2f} L",
+                f"{combustible_movimiento_fleet:.2f} L",
+                f"{combustible_total_fleet:.2f} L",
+                _CURRENCY(costo_ralenti_fleet),
+                _CURRENCY(st.session_state.costo_ralenti_real_fleet),
+                _CURRENCY(costo_movimiento_fleet),
+                _CURRENCY(costo_total_fleet),
+                _CURRENCY(st.session_state.merma_diaria_real_fleet),
+                _CURRENCY(st.session_state.merma_semanal_real_fleet),
+                _CURRENCY(st.session_state.merma_mensual_real_fleet),
+                _CURRENCY(st.session_state.merma_anual_real_fleet)
+            ]
+            render_detail_table([{'Concepto': c, 'Valor': v} for c, v in zip(_DETALLE_CONCEPTOS, valores_fleet)])
             
             # Mostrar el porcentaje de ralentí real considerado con estilo mejorado
             st.markdown("---")
@@ -1051,304 +1151,201 @@ if st.button("✅ Calcular"):
         with tabs[4]:
             st.subheader("💡 Análisis Económico")
 
-            st.markdown("""
-            ### 📈 **Comparación Económica: Implementar Monitoreo vs No Implementar**
+            # El análisis económico (tablas, figuras y simulación del ROI) solo se evalúa si se incluyó en la vista
+            if vista_resultados == "Operativo + Económico":
+                st.markdown("""
+                ### 📈 **Comparación Económica: Implementar Monitoreo vs No Implementar**
 
-            Esta sección muestra una comparación clara entre mantener el estado actual y adoptar el servicio de monitoreo de combustible para reducir las mermas por ralentí.
-            """)
+                Esta sección muestra una comparación clara entre mantener el estado actual y adoptar el servicio de monitoreo de combustible para reducir las mermas por ralentí.
+                """)
 
-            # Cálculos de ahorro y costos
-            total_ahorro_mensual = round(st.session_state.ahorro_anual / 12, 2)
-            total_ahorro_anual = round(st.session_state.ahorro_anual, 2)
-            total_neto_mensual = round(st.session_state.neto_mensual, 2)
-            total_neto_anual = round(st.session_state.neto_anual, 2)
+                # Cálculos de ahorro y costos
+                total_ahorro_mensual = round(st.session_state.ahorro_anual / 12, 2)
+                total_ahorro_anual = round(st.session_state.ahorro_anual, 2)
+                total_neto_mensual = round(st.session_state.neto_mensual, 2)
+                total_neto_anual = round(st.session_state.neto_anual, 2)
 
-            # Retorno de Inversión (ROI)
-            if st.session_state.neto_mensual > 0:
+                # Retorno de Inversión (ROI)
+                recoverable = st.session_state.recoverable
                 meses_para_recuperar = round(st.session_state.meses_para_recuperar, 2)
                 roi_days = round(st.session_state.roi_days, 2)
-            else:
-                meses_para_recuperar = float('inf')  # No recuperable
-                roi_days = float('inf')  # No recuperable
-
-            # DataFrame de Comparación Económica
-            data_comparacion = {
-                'Concepto': [
-                    'Ahorro Mensual',
-                    'Ahorro Anual',
-                    'Costo Inicial (Barras de Combustible)',
-                    'Costo Mensual (Monitoreo)',
-                    'Neto Mensual',
-                    'Neto Anual',
-                    'Retorno de Inversión (ROI - Meses)',
-                    'Retorno de Inversión (ROI - Días)'
-                ],
-                'Valor ($)': [
+
+                # DataFrames de Comparación Económica (valores y ROI por separado)
+                df_comparacion_valores, df_comparacion_roi = build_comparacion(
                     total_ahorro_mensual,
                     total_ahorro_anual,
                     round(st.session_state.costo_total_barras, 2),
                     round(renta_mensual * num_unidades, 2),  # Multiplicamos por num_unidades
                     total_neto_mensual,
                     total_neto_anual,
-                    f"{meses_para_recuperar} meses" if meses_para_recuperar != float('inf') else "No es recuperable",
-                    f"{roi_days} días" if roi_days != float('inf') else "No es recuperable"
-                ]
-            }
-            df_comparacion = pd.DataFrame(data_comparacion)
-
-            # Separar ROI para evitar errores de formateo
-            df_comparacion_valores = df_comparacion[df_comparacion['Concepto'].str.contains('Ahorro|Costo|Neto')]
-            df_comparacion_roi = df_comparacion[~df_comparacion['Concepto'].str.contains('Ahorro|Costo|Neto')]
-
-            # Tabla de Comparación Económica (Sin ROI)
-            st.markdown("### 📊 **Tabla de Comparación Económica**")
-            st.dataframe(df_comparacion_valores.style
-                .format({
-                    'Valor ($)': '${:,.2f}'
-                })
-                .applymap(highlight_positivo, subset=['Valor ($)'])
-            )
-
-            # Visualización de Comparación
-            st.markdown("### 📊 **Visualización de la Comparación Económica**")
-            fig_comparacion = px.bar(
-                df_comparacion_valores,
-                x='Concepto',
-                y='Valor ($)',
-                color='Concepto',
-                title='Comparación Económica',
-                labels={'Valor ($)': 'Valor en $'},
-                text='Valor ($)',
-                color_discrete_sequence=['#28a745', '#66B2FF', '#FF6666', '#FF6666']  # Verde, Azul, Rojo para 'Neto' etc.
-            )
-            fig_comparacion.update_traces(
-                texttemplate='$%{y:,.2f}',
-                textposition='outside',
-                textfont_color='green'  # Texto en verde
-            )
-            fig_comparacion.update_layout(
-                uniformtext_minsize=8,
-                uniformtext_mode='hide',
-                xaxis_title='Concepto',
-                yaxis_title='Valor ($)',
-                font=dict(size=12),
-                hovermode='closest'  # Mostrar solo el trazo más cercano
-            )
-            st.plotly_chart(fig_comparacion, use_container_width=True)
-
-            # **Nueva Sección: Explicación Detallada del ROI**
-            st.markdown("---")
-            st.markdown("## 🔍 **Cálculo Detallado del Retorno de Inversión (ROI)**")
-
-            # Presentar la Fórmula del ROI en Meses y Días
-            st.markdown("""
-            ### 📐 **Fórmulas del ROI**
-            """)
-
-            st.markdown("""
-            #### 📐 **Fórmula del ROI en Meses**
-            """)
-            st.latex(r'''
-            \text{ROI (Meses)} = \frac{\text{Costo Inicial}}{\text{Ahorro Neto Mensual}} = \frac{\text{Costo Inicial}}{\text{Ahorro Mensual} - \text{Costo Mensual}}
-            ''')
-
-            # Desglose de los Componentes
-            st.markdown(f"""
-            ### 📝 **Desglose de los Componentes**
-
-            - **Costo Inicial (Barras de Combustible):** ${round(st.session_state.costo_total_barras, 2):,}
-            - **Costo Mensual (Monitoreo):** ${round(renta_mensual * num_unidades, 2):,}
-            - **Ahorro Mensual:** ${round(total_ahorro_mensual, 2):,}
-            - **Ahorro Neto Mensual:** ${round(total_neto_mensual, 2):,}
-            - **Ahorro Neto Diario:** ${round(total_neto_mensual / 30, 2):,} por día
-            """)
-
-            # **Visualización de ROI**
-            st.markdown("---")
-            st.markdown("### 📈 **Visualización del ROI**")
-
-            # Mostrar ROI en Meses
-            if meses_para_recuperar != float('inf'):
-                st.metric("⏳ Retorno de Inversión (ROI)", f"{meses_para_recuperar} meses", delta=f"{meses_para_recuperar} meses")
-            else:
-                st.metric("⏳ Retorno de Inversión (ROI)", "No es recuperable con el ahorro actual", delta="")
-
-            # Mostrar ROI en Días
-            if roi_days != float('inf'):
-                st.metric("⏰ Retorno de Inversión (ROI)", f"{roi_days} días", delta=f"{roi_days} días")
-            else:
-                st.metric("⏰ Retorno de Inversión (ROI)", "No es recuperable con el ahorro actual", delta="")
-
-            st.markdown("---")
-
-            st.markdown(f"""
-            ### 📌 **Conclusión del Análisis Económico**
-
-            - **Ahorro Mensual y Anual:** Implementar el servicio de monitoreo de combustible puede generar un ahorro significativo en las mermas por ralentí.
-            - **Costo del Servicio:** Aunque existe un costo inicial por las barras de combustible y un costo mensual por el servicio, el ahorro potencial supera estos gastos, especialmente a largo plazo.
-            - **Retorno de Inversión (ROI):** El tiempo necesario para recuperar la inversión depende del ahorro neto mensual logrado. En este caso, el ROI es de {meses_para_recuperar} meses o {roi_days} días.
-            - **Viabilidad:** Basado en los parámetros ingresados, adoptar el servicio de monitoreo es económicamente viable y beneficioso para la empresa.
-            """)
-
-            # **Nueva Mejora: Visualización Interactiva del ROI y Ahorros Acumulados**
-            st.markdown("---")
-            st.markdown("## 📈 **Evolución del ROI y Ahorros Acumulados**")
-
-            # Crear DataFrame para la evolución mensual
-            meses = 60  # Simular hasta 60 meses (5 años)
-            data_evolucion = {
-                'Mes': list(range(1, meses + 1)),
-                'Ahorro Acumulado ($)': [],
-                'Costo Acumulado ($)': [],
-                'Ganancia Acumulada ($)': []
-            }
-
-            ahorro_acumulado = 0.0
-            costo_inicial = st.session_state.costo_total_barras
-            costo_mensual = st.session_state.renta_mensual * num_unidades
-            ahorro_mensual = st.session_state.ahorro_mensual
-
-            for mes in range(1, meses + 1):
-                ahorro_acumulado += ahorro_mensual
-                costo_acumulado = costo_inicial + (costo_mensual * mes)
-                ganancia_acumulada = ahorro_acumulado - costo_acumulado
-                data_evolucion['Ahorro Acumulado ($)'].append(round(ahorro_acumulado, 2))
-                data_evolucion['Costo Acumulado ($)'].append(round(costo_acumulado, 2))
-                data_evolucion['Ganancia Acumulada ($)'].append(round(ganancia_acumulada, 2))
-
-            df_evolucion = pd.DataFrame(data_evolucion)
-
-            # Determinar el mes del ROI
-            roi_mes = df_evolucion[df_evolucion['Ganancia Acumulada ($)'] >= 0]['Mes'].min()
-
-            # Crear el gráfico de línea con mejoras
-            fig_evolucion = go.Figure()
-
-            # Línea de Ahorro Acumulado
-            fig_evolucion.add_trace(go.Scatter(
-                x=df_evolucion['Mes'],
-                y=df_evolucion['Ahorro Acumulado ($)'],
-                mode='lines+markers',
-                name='Ahorro Acumulado',
-                line=dict(color='#00CC96'),
-                marker=dict(size=6),
-                hovertemplate='Ahorro Acumulado: $%{y:,.2f}<extra></extra>'  # Formateo con comas
-            ))
-
-            # Línea de Costo Acumulado
-            fig_evolucion.add_trace(go.Scatter(
-                x=df_evolucion['Mes'],
-                y=df_evolucion['Costo Acumulado ($)'],
-                mode='lines+markers',
-                name='Costo Acumulado',
-                line=dict(color='#FF0000'),
-                marker=dict(size=6),
-                hovertemplate='Costo Acumulado: $%{y:,.2f}<extra></extra>'  # Formateo con comas
-            ))
-
-            # Línea de Ganancia Acumulada
-            fig_evolucion.add_trace(go.Scatter(
-                x=df_evolucion['Mes'],
-                y=df_evolucion['Ganancia Acumulada ($)'],
-                mode='lines+markers',
-                name='Ganancia Acumulada',
-                line=dict(color='#636EFA'),
-                marker=dict(size=6),
-                hovertemplate='Ganancia Acumulada: $%{y:,.2f}<extra></extra>'  # Formateo con comas
-            ))
-
-            # Añadir línea vertical para el ROI
-            if not pd.isna(roi_mes):
-                fig_evolucion.add_vline(x=roi_mes, line_width=2, line_dash="dash", line_color="green")
-                fig_evolucion.add_annotation(
-                    x=roi_mes,
-                    y=max(df_evolucion['Ahorro Acumulado ($)']),
-                    text=f"ROI en el Mes {roi_mes}",
-                    showarrow=True,
-                    arrowhead=1,
-                    ax=-40,
-                    ay=-40,
-                    bgcolor="rgba(255,255,255,0.7)",
-                    bordercolor="green",
-                    borderwidth=1,
-                    font=dict(color="black", size=12)
+                    f"{meses_para_recuperar} meses" if recoverable else "No es recuperable",
+                    f"{roi_days} días" if recoverable else "No es recuperable"
                 )
 
-            fig_evolucion.update_layout(
-                title='Evolución del Ahorro, Costo y Ganancia Acumulada',
-                xaxis_title='Mes',
-                yaxis_title='Monto ($)',
-                legend_title='Concepto',
-                hovermode='closest',  # Cambiar a 'closest' para mostrar solo el trazo más cercano
-                font=dict(size=12),
-                plot_bgcolor='rgba(0,0,0,0)',  # Fondo transparente
-                paper_bgcolor='rgba(0,0,0,0)'  # Fondo transparente
-            )
-
-            # Añadir líneas de cuadrícula suaves
-            fig_evolucion.update_xaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-            fig_evolucion.update_yaxes(showgrid=True, gridwidth=1, gridcolor='LightGrey')
-
-            # Personalizar hover para mostrar únicamente el valor del trazo correspondiente
-            for trace in fig_evolucion.data:
-                trace.update(
-                    hoveron='points+fills',
-                    hoverinfo='x+y',
-                    hovertemplate='Mes: %{x}<br>%{y:$,.2f}<extra></extra>'
+                # Tabla de Comparación Económica (Sin ROI)
+                st.markdown("### 📊 **Tabla de Comparación Económica**")
+                # Tabla estática: 6 filas sin orden ni filtros no necesitan el componente interactivo
+                st.markdown(render_comparacion_html(df_comparacion_valores), unsafe_allow_html=True)
+
+                # Visualización de Comparación
+                st.markdown("### 📊 **Visualización de la Comparación Económica**")
+                # Una sola traza con un color por barra (en lugar de una traza por concepto)
+                colores_comparacion = df_comparacion_valores['Concepto'].map(_COMPARACION_COLORES).tolist()
+                fig_comparacion = go.Figure(go.Bar(
+                    x=df_comparacion_valores['Concepto'],
+                    y=df_comparacion_valores['Valor ($)'],
+                    text=df_comparacion_valores['Valor ($)'],
+                    marker_color=colores_comparacion
+                ))
+                fig_comparacion = style_bar(
+                    fig_comparacion,
+                    '$%{y:,.2f}',
+                    title='Comparación Económica',
+                    xaxis_title='Concepto',
+                    yaxis_title='Valor ($)'
                 )
-
-            fig_evolucion.update_layout(
-                hovermode='x unified',
-                hoverlabel=dict(
-                    bgcolor="#2b2b2b",  # Fondo oscuro para el tooltip
-                    font_size=12,
-                    font_family="Arial",
-                    font=dict(color='white')  # Texto en blanco
-                ),
-                xaxis=dict(
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128, 128, 128, 0.2)',
-                    showspikes=True,
-                    spikemode='across',
-                    spikesnap='cursor',
-                    spikecolor='rgba(0,0,0,0.3)',
-                    spikethickness=1
-                ),
-                yaxis=dict(
-                    showgrid=True,
-                    gridwidth=1,
-                    gridcolor='rgba(128, 128, 128, 0.2)',
-                    showspikes=True,
-                    spikemode='across',
-                    spikesnap='cursor',
-                    spikecolor='rgba(0,0,0,0.3)',
-                    spikethickness=1
-                ),
-                spikedistance=1000
-            )
-
-            st.plotly_chart(fig_evolucion, use_container_width=True)
-
-            st.markdown("""
-            ### 📌 **Interpretación del Gráfico**
-
-            - **Ahorro Acumulado:** Representa la suma de los ahorros mensuales generados.
-            - **Costo Acumulado:** Incluye el costo inicial de las barras de combustible más los costos mensuales de monitoreo.
-            - **Ganancia Acumulada:** Es la diferencia entre el ahorro acumulado y el costo acumulado. 
-              - Si es negativa, indica una pérdida.
-              - Si es positiva, indica una ganancia.
-            - **Punto de ROI:** La línea vertical verde y la anotación indican el mes exacto en que se recupera la inversión inicial, es decir, cuando el ahorro acumulado supera al costo acumulado.
-            """)
-
-            st.markdown("---")
-
-            # Recomendación Final
-            st.markdown("""
-            ### 🌟 **Recomendación Final**
-
-            Basado en los cálculos y visualizaciones anteriores, recomendamos implementar el servicio de monitoreo de combustible para reducir las mermas por ralentí. Esta inversión no solo optimizará el uso de combustible sino que también mejorará la eficiencia operativa de tu flota.
-            """)
-
-            # Opcional: Añadir una imagen o gráfico adicional para reforzar la recomendación
-            # st.image("path_to_image.jpg", caption="Optimiza tu flota con nuestro servicio", use_column_width=True)
+                st.plotly_chart(fig_comparacion, use_container_width=True)
+
+                # **Nueva Sección: Explicación Detallada del ROI**
+                st.markdown("---")
+                st.markdown("## 🔍 **Cálculo Detallado del Retorno de Inversión (ROI)**")
+
+                # Presentar la Fórmula del ROI en Meses y Días
+                st.markdown("""
+                ### 📐 **Fórmulas del ROI**
+                """)
+
+                st.markdown("""
+                #### 📐 **Fórmula del ROI en Meses**
+                """)
+                st.latex(r'''
+                \text{ROI (Meses)} = \frac{\text{Costo Inicial}}{\text{Ahorro Neto Mensual}} = \frac{\text{Costo Inicial}}{\text{Ahorro Mensual} - \text{Costo Mensual}}
+                ''')
+
+                # Desglose de los Componentes
+                st.markdown(f"""
+                ### 📝 **Desglose de los Componentes**
+
+                - **Costo Inicial (Barras de Combustible):** ${round(st.session_state.costo_total_barras, 2):,}
+                - **Costo Mensual (Monitoreo):** ${round(renta_mensual * num_unidades, 2):,}
+                - **Ahorro Mensual:** ${round(total_ahorro_mensual, 2):,}
+                - **Ahorro Neto Mensual:** ${round(total_neto_mensual, 2):,}
+                - **Ahorro Neto Diario:** ${round(total_neto_mensual / 30, 2):,} por día
+                """)
+
+                # **Visualización de ROI**
+                st.markdown("---")
+                st.markdown("### 📈 **Visualización del ROI**")
+
+                # Mostrar ROI en Meses y en Días en una sola fila
+                col_meses, col_dias = st.columns(2)
+                if recoverable:
+                    col_meses.metric("⏳ Retorno de Inversión (ROI)", f"{meses_para_recuperar} meses", delta=f"{meses_para_recuperar} meses")
+                    col_dias.metric("⏰ Retorno de Inversión (ROI)", f"{roi_days} días", delta=f"{roi_days} días")
+                else:
+                    col_meses.metric("⏳ Retorno de Inversión (ROI)", "No es recuperable con el ahorro actual", delta="")
+                    col_dias.metric("⏰ Retorno de Inversión (ROI)", "No es recuperable con el ahorro actual", delta="")
+
+                st.markdown("---")
+
+                if recoverable:
+                    roi_texto = f"el ROI es de {meses_para_recuperar} meses o {roi_days} días"
+                else:
+                    roi_texto = "la inversión no es recuperable con el ahorro actual"
+
+                st.markdown(f"""
+                ### 📌 **Conclusión del Análisis Económico**
+
+                - **Ahorro Mensual y Anual:** Implementar el servicio de monitoreo de combustible puede generar un ahorro significativo en las mermas por ralentí.
+                - **Costo del Servicio:** Aunque existe un costo inicial por las barras de combustible y un costo mensual por el servicio, el ahorro potencial supera estos gastos, especialmente a largo plazo.
+                - **Retorno de Inversión (ROI):** El tiempo necesario para recuperar la inversión depende del ahorro neto mensual logrado. En este caso, {roi_texto}.
+                - **Viabilidad:** Basado en los parámetros ingresados, adoptar el servicio de monitoreo es económicamente viable y beneficioso para la empresa.
+                """)
+
+                # **Nueva Mejora: Visualización Interactiva del ROI y Ahorros Acumulados**
+                st.markdown("---")
+                st.markdown("## 📈 **Evolución del ROI y Ahorros Acumulados**")
+
+                # Si la inversión no es recuperable no hay punto de ROI que mostrar: se omite
+                # la simulación mensual y la construcción de la gráfica
+                if recoverable:
+                    # Series de la evolución mensual (cálculo vectorizado)
+                    meses = 60  # Simular hasta 60 meses (5 años)
+                    costo_inicial = st.session_state.costo_total_barras
+                    costo_mensual = st.session_state.renta_mensual * num_unidades
+                    ahorro_mensual = st.session_state.ahorro_mensual
+
+                    meses_arr = np.arange(1, meses + 1)  # Eje x compartido por los tres trazos
+                    ahorro_acum = (ahorro_mensual * meses_arr).round(2)
+                    costo_acum = (costo_inicial + costo_mensual * meses_arr).round(2)
+                    ganancia_acum = (ahorro_mensual * meses_arr - (costo_inicial + costo_mensual * meses_arr)).round(2)
+
+                    # Determinar el mes del ROI (primer mes con ganancia acumulada no negativa);
+                    # None si no se alcanza dentro del horizonte simulado
+                    roi_idx = int(np.argmax(ganancia_acum >= 0))
+                    roi_mes = roi_idx + 1 if ganancia_acum[roi_idx] >= 0 else None
+
+                    # La figura se construye una sola vez por sesión y se guarda en session_state;
+                    # en cada rerun solo se actualizan sus datos dentro de un batch_update
+                    if 'fig_evolucion' not in st.session_state:
+                        st.session_state.fig_evolucion = build_evolucion_fig()
+                    fig_evolucion = st.session_state.fig_evolucion
+
+                    # Solo se actualiza la figura si cambiaron los datos que la definen. st.plotly_chart
+                    # se llama en cada rerun: Streamlit elimina los elementos que no se vuelven a emitir
+                    fig_evolucion_key = (ahorro_mensual, costo_inicial, costo_mensual, meses)
+                    if st.session_state.get('fig_evolucion_key') != fig_evolucion_key:
+                        with fig_evolucion.batch_update():
+                            fig_evolucion.data[0].update(x=meses_arr, y=ahorro_acum)
+                            fig_evolucion.data[1].update(x=meses_arr, y=costo_acum)
+                            fig_evolucion.data[2].update(x=meses_arr, y=ganancia_acum)
+                            # Limpiar la línea y anotación de ROI del cálculo anterior
+                            fig_evolucion.layout.shapes = ()
+                            fig_evolucion.layout.annotations = ()
+
+                        # Añadir línea vertical para el ROI
+                        if roi_mes is not None:
+                            fig_evolucion.add_vline(x=roi_mes, line_width=2, line_dash="dash", line_color="green")
+                            fig_evolucion.add_annotation(
+                                x=roi_mes,
+                                y=ahorro_acum.max(),
+                                text=f"ROI en el Mes {roi_mes}",
+                                showarrow=True,
+                                arrowhead=1,
+                                ax=-40,
+                                ay=-40,
+                                bgcolor="rgba(255,255,255,0.7)",
+                                bordercolor="green",
+                                borderwidth=1,
+                                font=dict(color="black", size=12)
+                            )
+                        st.session_state.fig_evolucion_key = fig_evolucion_key
+
+                    st.plotly_chart(fig_evolucion, use_container_width=True)
+
+                    st.markdown("""
+                    ### 📌 **Interpretación del Gráfico**
+
+                    - **Ahorro Acumulado:** Representa la suma de los ahorros mensuales generados.
+                    - **Costo Acumulado:** Incluye el costo inicial de las barras de combustible más los costos mensuales de monitoreo.
+                    - **Ganancia Acumulada:** Es la diferencia entre el ahorro acumulado y el costo acumulado. 
+                      - Si es negativa, indica una pérdida.
+                      - Si es positiva, indica una ganancia.
+                    - **Punto de ROI:** La línea vertical verde y la anotación indican el mes exacto en que se recupera la inversión inicial, es decir, cuando el ahorro acumulado supera al costo acumulado.
+                    """)
+                else:
+                    st.info("ROI no recuperable — gráfico omitido")
+
+                st.markdown("---")
+
+                # Recomendación Final
+                st.markdown("""
+                ### 🌟 **Recomendación Final**
+
+                Basado en los cálculos y visualizaciones anteriores, recomendamos implementar el servicio de monitoreo de combustible para reducir las mermas por ralentí. Esta inversión no solo optimizará el uso de combustible sino que también mejorará la eficiencia operativa de tu flota.
+                """)
+
+                # Opcional: Añadir una imagen o gráfico adicional para reforzar la recomendación
+                # st.image("path_to_image.jpg", caption="Optimiza tu flota con nuestro servicio", use_column_width=True)
+            else:
+                st.info("Análisis económico omitido — seleccione \"Operativo + Económico\" y presione Calcular")